@@ -85,6 +85,15 @@ echo ========================================
 echo [APP] Starting Flask application...
 echo ========================================
 
+REM Create or update the database schema (idempotent)
+echo [DATABASE] Initializing database...
+flask --app src/app.py init-db
+if %errorlevel% neq 0 (
+    echo [ERROR]: Unable to initialize the database
+    pause
+    exit /b 1
+)
+
 REM Launch app.py in background
 start "Flask API" python src/app.py
 
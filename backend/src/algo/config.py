@@ -15,6 +15,19 @@ CSV_FILE_PATH = "data.csv"  # Path to the CSV file containing student data
 MAX_ATTEMPTS = 10  # Number of different initialization strategies
 MAX_LOCAL_ITERATIONS = 50  # Maximum iterations for local optimization
 GLOBAL_MAX_ITERATIONS = 100  # Maximum iterations for global optimization
+WARM_START_ITERATIONS = 10  # Local optimization budget when re-optimizing a previous grouping
+
+# Initialization strategy of each attempt ("mutual", "community", "kmeans", "spectral",
+# "random"), cycled when shorter than MAX_ATTEMPTS
+ATTEMPT_STRATEGIES = ["mutual", "community"] + ["kmeans"] * 3 + ["spectral"] * 3 + ["random"] * 2
+
+# KMeans parameters
+KMEANS_BACKEND = "auto"  # "kmeans", "minibatch" or "auto" (MiniBatchKMeans for large classes)
+MINIBATCH_THRESHOLD = 1000  # Number of students from which "auto" switches to MiniBatchKMeans
+KMEANS_CANDIDATES = 10  # Maximum single-initialization KMeans fits, run only as attempts need them
+
+# Seed of every random source of the clustering (None for a different run each time)
+RANDOM_SEED = None
 
 # Scoring weights
 MUTUAL_BONUS = 1.5  # Bonus multiplier for mutual affinities
@@ -3,13 +3,17 @@ Module for reading and processing preference data from CSV files.
 Handles weighted voting system and affinity matrix creation.
 """
 
-import pandas as pd
 import numpy as np
-from config import EXCLUSIONS, TOTAL_POINTS, MUTUAL_BONUS, UNILATERAL_WEIGHT
+try:
+    from .config import EXCLUSIONS, TOTAL_POINTS, MUTUAL_BONUS, UNILATERAL_WEIGHT
+except ImportError:  # Executed as a script from the algo directory
+    from config import EXCLUSIONS, TOTAL_POINTS, MUTUAL_BONUS, UNILATERAL_WEIGHT
 
 
 def readPreferences(csvFile):
     """Reading and processing preferences from CSV with weighted voting system."""
+    import pandas as pd  # Only needed for CSV input, the API builds matrices from the database
+
     df = pd.read_csv(csvFile)
     
     # Extract emails from the "nom" column
@@ -52,14 +56,50 @@ def readPreferences(csvFile):
                 k = namesIndex[classmate]
                 affinity[i][k] = points * normalizationFactor
     
-    # Create final affinity matrix with mutual bonus
+    return names, combineAffinities(affinity)
+
+
+def combineAffinities(affinity):
+    """Combines the normalized votes into the final affinity matrix with mutual bonus."""
     mutualAffinity = np.minimum(affinity, affinity.T)  # Mutual affinities
     unilateralAffinity = affinity + affinity.T - 2 * mutualAffinity
     
     # Final score: mutual × 1.5 + unilateral × 1.0
-    finalAffinity = mutualAffinity * MUTUAL_BONUS + unilateralAffinity * UNILATERAL_WEIGHT
+    return mutualAffinity * MUTUAL_BONUS + unilateralAffinity * UNILATERAL_WEIGHT
+
+
+def affinityFromVotes(n, voterIndices, targetIndices, points, normalize=True):
+    """
+    Builds the affinity matrix from vote arrays, without any Python loop.
+    
+    Each voter's points are normalized to TOTAL_POINTS like in readPreferences,
+    unless normalize is False because the caller already did it. Self-votes are
+    ignored and repeated (voter, target) pairs are summed.
+    
+    Args:
+        n (int): Number of students
+        voterIndices (numpy.ndarray): Index of the voting student for each vote
+        targetIndices (numpy.ndarray): Index of the chosen classmate for each vote
+        points (numpy.ndarray): Points given by each vote
+        normalize (bool): Whether to rescale each voter's points to TOTAL_POINTS
+        
+    Returns:
+        numpy.ndarray: Final affinity matrix with mutual bonus
+    """
+    voterIndices = np.asarray(voterIndices, dtype=np.intp)
+    targetIndices = np.asarray(targetIndices, dtype=np.intp)
+    points = np.asarray(points, dtype=float)
+    
+    valid = (voterIndices != targetIndices) & (points > 0)
+    affinity = np.zeros((n, n), dtype=float)
+    np.add.at(affinity, (voterIndices[valid], targetIndices[valid]), points[valid])
+    
+    # Normalize points so that each voter distributes TOTAL_POINTS
+    if normalize:
+        totals = affinity.sum(axis=1, keepdims=True)
+        np.divide(affinity * TOTAL_POINTS, totals, out=affinity, where=totals > 0)
     
-    return names, finalAffinity
+    return combineAffinities(affinity)
 
 
 def createStudentFeatures(names, affinityMatrix):
@@ -2,7 +2,10 @@
 Module for displaying results and generating detailed output.
 """
 
-from config import GROUP_SIZE
+try:
+    from .config import GROUP_SIZE, TOTAL_POINTS, EXCLUSIONS
+except ImportError:  # Executed as a script from the algo directory
+    from config import GROUP_SIZE, TOTAL_POINTS, EXCLUSIONS
 
 
 def displayDetailedResults(groups, satisfaction, rawScore, affinityMatrix, names):
@@ -74,8 +77,6 @@ def displayDetailedResults(groups, satisfaction, rawScore, affinityMatrix, names
 
 def displayConfiguration():
     """Display current configuration settings"""
-    from config import GROUP_SIZE, TOTAL_POINTS, EXCLUSIONS
-    
     print("  WEIGHTED VOTING GROUP CLUSTERING SYSTEM")
     print("=" * 70)
     
@@ -96,4 +97,16 @@ def displaySummary(finalGroups, satisfaction, names):
     print(f"    Satisfaction: {satisfaction:.1%}")
     print(f"    Balance Score: {balanceScore:.1%}")
     print(f"    Groups: {len(finalGroups)} | Sizes: {sizes}")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+
+
+def displayPhaseTimings(timings):
+    """Display the time spent in each phase of the clustering engine"""
+    rows = timings.summary()
+    total = sum(seconds for _, _, seconds in rows)
+    
+    print(f"\n TIMINGS:")
+    for phase, count, seconds in rows:
+        share = seconds / total if total else 0.0
+        print(f"    {phase:<20} {seconds * 1000:9.1f} ms  {share:6.1%}  ({count}x)")
+    print(f"    {'total':<20} {total * 1000:9.1f} ms")
@@ -0,0 +1,324 @@
+"""
+Module containing graph-based initialization strategies for the clustering.
+
+These strategies build a first grouping directly from the vote graph instead of
+from the dense feature vectors used by KMeans, which makes them much cheaper on
+large classes.
+"""
+
+import heapq
+import numpy as np
+from scipy import sparse
+
+
+def balancedCapacities(n, groupSize):
+    """
+    Computes the balanced group sizes used for n students.
+
+    Mirrors the group count and size distribution of forceInitialBalance so that
+    groups built with these capacities are left untouched by it.
+
+    Args:
+        n (int): Number of students
+        groupSize (int): Target size of each group
+
+    Returns:
+        list: Size of each group, largest first
+    """
+    groupCount = max(1, n // groupSize)
+    if n % groupSize != 0:
+        groupCount += 1
+
+    baseSize, remainder = divmod(n, groupCount)
+    return [baseSize + (1 if i < remainder else 0) for i in range(groupCount)]
+
+
+def pairWeights(affinityMatrix):
+    """
+    Extracts the non-zero pair weights of the upper triangle of A + A^T.
+
+    Works on dense arrays as well as on scipy sparse matrices, in which case
+    only the stored votes are visited.
+
+    Args:
+        affinityMatrix (numpy.ndarray or scipy.sparse matrix): Affinity scores between students
+
+    Returns:
+        tuple: (rows, cols, weights) arrays describing each weighted pair
+    """
+    if sparse.issparse(affinityMatrix):
+        symmetric = sparse.triu(affinityMatrix + affinityMatrix.T, k=1).tocoo()
+        mask = symmetric.data > 0
+        return symmetric.row[mask], symmetric.col[mask], symmetric.data[mask]
+
+    matrix = np.asarray(affinityMatrix, dtype=float)
+    symmetric = np.triu(matrix + matrix.T, k=1)
+    rows, cols = np.nonzero(symmetric > 0)
+    return rows, cols, symmetric[rows, cols]
+
+
+def groupAffinity(matrix, personIdx, members):
+    """Total affinity in both directions between a person and a list of members"""
+    if not members:
+        return 0.0
+    return float(matrix[personIdx, members].sum() + matrix[members, personIdx].sum())
+
+
+def greedyMutualSeeding(names, affinityMatrix, groupSize):
+    """
+    Builds groups greedily from the strongest mutual pairs.
+
+    Pairs are popped from a max-heap ordered by their combined affinity. Two free
+    students open a new group, a free student joins the group of its partner when
+    it still has room, so strong pairs grow into triads and so on up to the group
+    capacity. Students left without a usable pair are placed where they have the
+    most affinity, scored from their own votes only; those without any go to a
+    new group while slots remain, then to the open group with the most room.
+    Runs in O((E + n) log(E + n)) on sparse input, where E is the number of
+    non-zero votes.
+
+    Args:
+        names (list): List of all student names
+        affinityMatrix (numpy.ndarray or scipy.sparse matrix): Affinity scores between students
+        groupSize (int): Target size of each group
+
+    Returns:
+        list: List of groups, each containing list of student names
+    """
+    n = len(names)
+    if n == 0:
+        return []
+
+    matrix = affinityMatrix.tocsr() if sparse.issparse(affinityMatrix) else np.asarray(affinityMatrix)
+    capacities = balancedCapacities(n, groupSize)
+
+    rows, cols, weights = pairWeights(matrix)
+    heap = list(zip((-weights).tolist(), rows.tolist(), cols.tolist()))
+    heapq.heapify(heap)
+
+    groupOf = [-1] * n
+    groups = []
+    unassigned = n
+
+    while heap and unassigned > 0:
+        _, i, j = heapq.heappop(heap)
+        groupI, groupJ = groupOf[i], groupOf[j]
+
+        if groupI == -1 and groupJ == -1:
+            # Open a new group with the pair if a slot is still available
+            if len(groups) < len(capacities) and capacities[len(groups)] >= 2:
+                groupOf[i] = groupOf[j] = len(groups)
+                groups.append([i, j])
+                unassigned -= 2
+        elif groupI == -1 and len(groups[groupJ]) < capacities[groupJ]:
+            groupOf[i] = groupJ
+            groups[groupJ].append(i)
+            unassigned -= 1
+        elif groupJ == -1 and len(groups[groupI]) < capacities[groupI]:
+            groupOf[j] = groupI
+            groups[groupI].append(j)
+            unassigned -= 1
+
+    # Place the remaining students where they have the most affinity
+    symmetric = (matrix + matrix.T).tocsr() if sparse.issparse(matrix) else None
+    groupOf = np.array(groupOf)
+    roomHeap = [(len(members) - capacities[g], g) for g, members in enumerate(groups)]
+    heapq.heapify(roomHeap)
+
+    for person in np.flatnonzero(groupOf == -1).tolist():
+        if symmetric is not None:
+            start, stop = symmetric.indptr[person], symmetric.indptr[person + 1]
+            neighbours, neighbourWeights = symmetric.indices[start:stop], symmetric.data[start:stop]
+        else:
+            row = matrix[person] + matrix[:, person]
+            neighbours = np.flatnonzero(row)
+            neighbourWeights = row[neighbours]
+
+        # Affinity with each group holding one of the person's neighbours, in O(degree)
+        placed = groupOf[neighbours] >= 0
+        candidates, inverse = np.unique(groupOf[neighbours][placed], return_inverse=True)
+        scores = np.bincount(inverse, weights=neighbourWeights[placed], minlength=len(candidates))
+
+        bestGroup = None
+        for g in np.argsort(-scores, kind="stable").tolist():
+            if scores[g] <= 0:
+                break
+            if len(groups[candidates[g]]) < capacities[candidates[g]]:
+                bestGroup = int(candidates[g])
+                break
+
+        if bestGroup is None:
+            if len(groups) < len(capacities):
+                bestGroup = len(groups)
+                groups.append([])
+            else:
+                # Open group with the most room, stale heap entries are skipped
+                while True:
+                    negativeRoom, g = heapq.heappop(roomHeap)
+                    if negativeRoom == len(groups[g]) - capacities[g]:
+                        break
+                bestGroup = g
+
+        groupOf[person] = bestGroup
+        groups[bestGroup].append(person)
+        heapq.heappush(roomHeap, (len(groups[bestGroup]) - capacities[bestGroup], bestGroup))
+
+    return [[names[i] for i in members] for members in groups]
+
+
+def _louvainLevel(adjacency, resolution, maxSweeps):
+    """
+    Runs the local moving phase of Louvain on one level of the graph.
+
+    Args:
+        adjacency (scipy.sparse.csr_matrix): Symmetric weighted adjacency matrix
+        resolution (float): Modularity resolution, higher values give smaller communities
+        maxSweeps (int): Maximum number of passes over all nodes
+
+    Returns:
+        tuple: (labels, moved) with community labels numbered from 0 and whether any node moved
+    """
+    n = adjacency.shape[0]
+    indptr, indices, data = adjacency.indptr, adjacency.indices, adjacency.data
+    degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+    totalWeight = degrees.sum()
+
+    community = np.arange(n)
+    communityDegree = degrees.copy()
+    moved = False
+
+    for _ in range(maxSweeps):
+        improved = False
+
+        for i in range(n):
+            currentCommunity = community[i]
+            degree = degrees[i]
+
+            # Weight of the links from i to each neighbouring community
+            links = {}
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                if j != i:
+                    links[community[j]] = links.get(community[j], 0.0) + data[p]
+
+            communityDegree[currentCommunity] -= degree
+            bestCommunity = currentCommunity
+            bestGain = links.get(currentCommunity, 0.0) - resolution * communityDegree[currentCommunity] * degree / totalWeight
+
+            for candidate, weight in links.items():
+                gain = weight - resolution * communityDegree[candidate] * degree / totalWeight
+                if gain > bestGain + 1e-12:
+                    bestCommunity, bestGain = candidate, gain
+
+            communityDegree[bestCommunity] += degree
+            if bestCommunity != currentCommunity:
+                community[i] = bestCommunity
+                improved = moved = True
+
+        if not improved:
+            break
+
+    _, labels = np.unique(community, return_inverse=True)
+    return labels, moved
+
+
+def louvainCommunities(affinityMatrix, resolution=1.0, maxLevels=10, maxSweeps=20):
+    """
+    Detects communities of the vote graph by modularity optimization (Louvain).
+
+    Works directly on the sparse graph: each level moves nodes between
+    neighbouring communities, then collapses communities into single nodes,
+    until no node moves anymore. Each sweep is linear in the number of votes.
+
+    Args:
+        affinityMatrix (numpy.ndarray or scipy.sparse matrix): Affinity scores between students
+        resolution (float): Modularity resolution, higher values give smaller communities
+        maxLevels (int): Maximum number of aggregation levels
+        maxSweeps (int): Maximum number of local moving passes per level
+
+    Returns:
+        numpy.ndarray: Community label of each student
+    """
+    matrix = sparse.csr_matrix(affinityMatrix, dtype=float)
+    adjacency = (matrix + matrix.T).tocsr()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+
+    n = adjacency.shape[0]
+    membership = np.arange(n)
+    if adjacency.nnz == 0:
+        return membership
+
+    for _ in range(maxLevels):
+        labels, moved = _louvainLevel(adjacency, resolution, maxSweeps)
+        if not moved:
+            break
+
+        membership = labels[membership]
+
+        # Collapse each community into a single node
+        communityCount = labels.max() + 1
+        projection = sparse.csr_matrix(
+            (np.ones(len(labels)), (np.arange(len(labels)), labels)),
+            shape=(len(labels), communityCount)
+        )
+        adjacency = (projection.T @ adjacency @ projection).tocsr()
+
+    return membership
+
+
+def communityDetectionSeeding(names, affinityMatrix, groupSize, resolution=1.0):
+    """
+    Builds groups from the communities of the vote graph.
+
+    Communities larger than a group are split with greedyMutualSeeding on their
+    own sub-graph, then all pieces are packed into the balanced group capacities,
+    largest first, each piece joining the group it has the most affinity with
+    among those it fits in. Pieces that fit nowhere are spread over the groups
+    with the most room left.
+
+    Args:
+        names (list): List of all student names
+        affinityMatrix (numpy.ndarray or scipy.sparse matrix): Affinity scores between students
+        groupSize (int): Target size of each group
+        resolution (float): Modularity resolution passed to louvainCommunities
+
+    Returns:
+        list: List of groups, each containing list of student names
+    """
+    n = len(names)
+    if n == 0:
+        return []
+
+    matrix = affinityMatrix.tocsr() if sparse.issparse(affinityMatrix) else np.asarray(affinityMatrix)
+    capacities = balancedCapacities(n, groupSize)
+    labels = louvainCommunities(matrix, resolution=resolution)
+
+    # Split communities into pieces no larger than a group
+    pieces = []
+    for community in range(labels.max() + 1):
+        members = np.flatnonzero(labels == community).tolist()
+        if len(members) <= capacities[0]:
+            pieces.append(members)
+        else:
+            pieces.extend(greedyMutualSeeding(members, matrix[members][:, members], groupSize))
+
+    # Pack the pieces into the groups
+    groups = [[] for _ in capacities]
+    pieces.sort(key=len, reverse=True)
+
+    for piece in pieces:
+        fitting = [g for g in range(len(groups)) if capacities[g] - len(groups[g]) >= len(piece)]
+
+        if fitting:
+            bestGroup = max(fitting, key=lambda g: (
+                sum(groupAffinity(matrix, person, groups[g]) for person in piece),
+                -(capacities[g] - len(groups[g]))
+            ))
+            groups[bestGroup].extend(piece)
+        else:
+            for person in piece:
+                roomiest = max(range(len(groups)), key=lambda g: capacities[g] - len(groups[g]))
+                groups[roomiest].append(person)
+
+    return [[names[i] for i in members] for members in groups if members]
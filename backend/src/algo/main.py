@@ -2,24 +2,76 @@
 Main execution module for the weighted voting group clustering system.
 """
 
+import argparse
+import sys
 import warnings
+from contextlib import nullcontext, redirect_stdout
 warnings.filterwarnings('ignore')
 
 from config import GROUP_SIZE, CSV_FILE_PATH, EXCLUSIONS
 from data_processing import readPreferences
 from optimization import hybridBalancedClustering
 from scoring import calculateSatisfactionScore
-from display import displayConfiguration, displayDetailedResults, displaySummary
+from display import displayConfiguration, displayDetailedResults, displaySummary, displayPhaseTimings
+from metrics import PhaseTimings, timer
+from profiling import Tracer
 
 
-def main():
-    """Main execution function"""
+def parseArguments(argv=None):
+    """
+    Parses the command line options.
+
+    Args:
+        argv (list): Arguments to parse, sys.argv by default
+
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+    parser = argparse.ArgumentParser(description="Weighted voting group clustering")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write the spans of the clustering phases to FILE ('-' for stdout, "
+                             "the report then goes to stderr)")
+    parser.add_argument("--trace-format", choices=("json", "folded"), default="json",
+                        help="Format of the trace: JSON spans or folded stacks for flame graphs")
+    return parser.parse_args(argv)
+
+
+def writeTrace(tracer, path, traceFormat):
+    """
+    Writes the spans collected by the tracer.
+
+    Args:
+        tracer (Tracer): The tracer of the run
+        path (str): Output file, '-' for stdout
+        traceFormat (str): 'json' or 'folded'
+    """
+    content = tracer.toJson() if traceFormat == "json" else tracer.toFolded()
+    if path == "-":
+        sys.stdout.write(content)
+        return
+    with open(path, "w") as traceFile:
+        traceFile.write(content)
+    print(f"  Trace written to {path}")
+
+
+def runClustering(timings, tracer):
+    """
+    Clusters the students of the CSV file and prints the report.
+
+    Args:
+        timings (PhaseTimings): Receives the duration of each phase
+        tracer (Tracer): Receives the spans of the clustering, may be None
+
+    Returns:
+        bool: True if the clustering succeeded
+    """
     displayConfiguration()
     
     try:
         # Read data
         print(f"\n  Reading preferences from CSV...")
-        names, affinityMatrix = readPreferences(CSV_FILE_PATH)
+        with timer("ingestion", timings):
+            names, affinityMatrix = readPreferences(CSV_FILE_PATH)
         
         print(f"  {len(names)} students loaded")
         print(f"    Each student distributes 100 points")
@@ -29,7 +81,8 @@ def main():
         
         # Perform hybrid clustering
         print(f"  Starting weighted voting clustering...")
-        finalGroups = hybridBalancedClustering(names, affinityMatrix, GROUP_SIZE)
+        finalGroups = hybridBalancedClustering(names, affinityMatrix, GROUP_SIZE, metrics=timings,
+                                               tracer=tracer)
         
         if finalGroups is None:
             raise Exception("Clustering failed to produce valid groups")
@@ -37,7 +90,8 @@ def main():
         print("\n" + "="*70)
         
         # Calculate final scores
-        satisfaction, rawScore = calculateSatisfactionScore(finalGroups, affinityMatrix, names)
+        with timer("scoring", timings):
+            satisfaction, rawScore = calculateSatisfactionScore(finalGroups, affinityMatrix, names)
         
         # Display results
         displayDetailedResults(finalGroups, satisfaction, rawScore, affinityMatrix, names)
@@ -45,12 +99,32 @@ def main():
         # Display summary
         displaySummary(finalGroups, satisfaction, names)
         
+        # Display time spent per phase
+        displayPhaseTimings(timings)
+        return True
+        
     except FileNotFoundError:
         print(f"  Error: Could not find '{CSV_FILE_PATH}'")
     except Exception as e:
         print(f"  Error: {str(e)}")
         import traceback
         traceback.print_exc()
+    return False
+
+
+def main(argv=None):
+    """Main execution function"""
+    options = parseArguments(argv)
+    timings = PhaseTimings()
+    tracer = Tracer() if options.trace else None
+    
+    # With the trace on stdout, the report goes to stderr so that the trace can be piped
+    report = redirect_stdout(sys.stderr) if options.trace == "-" else nullcontext()
+    with report:
+        succeeded = runClustering(timings, tracer)
+    
+    if succeeded and tracer is not None:
+        writeTrace(tracer, options.trace, options.trace_format)
 
 
 if __name__ == "__main__":
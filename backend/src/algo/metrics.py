@@ -0,0 +1,66 @@
+"""
+Module providing a small pluggable metrics interface for the clustering engine.
+
+The engine times its phases (ingestion, feature building, each initialization
+strategy, balancing, local optimization, scoring) through timer(), which
+reports to a recorder. Recorders only implement observe(), so the CLI can
+collect a per-phase breakdown while the API feeds its own metrics registry.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class MetricsRecorder:
+    """Recorder receiving the duration of each engine phase, ignores them by default"""
+
+    def observe(self, phase, seconds):
+        """
+        Records one execution of a phase.
+
+        Args:
+            phase (str): Name of the phase
+            seconds (float): Duration of the execution
+        """
+
+
+class PhaseTimings(MetricsRecorder):
+    """Recorder accumulating the number of executions and total duration of each phase"""
+
+    def __init__(self):
+        self.phases = {}
+
+    def observe(self, phase, seconds):
+        count, total = self.phases.get(phase, (0, 0.0))
+        self.phases[phase] = (count + 1, total + seconds)
+
+    def summary(self):
+        """
+        Lists the phases from the most to the least time consuming.
+
+        Returns:
+            list: (phase, count, totalSeconds) tuples
+        """
+        rows = [(phase, count, total) for phase, (count, total) in self.phases.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+NULL_RECORDER = MetricsRecorder()
+
+
+@contextmanager
+def timer(phase, recorder=None):
+    """
+    Times the enclosed block and reports it to the recorder as one execution of phase.
+
+    Args:
+        phase (str): Name of the phase
+        recorder (MetricsRecorder): Receives the duration, nothing is recorded if None
+    """
+    if recorder is None:
+        recorder = NULL_RECORDER
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.observe(phase, time.perf_counter() - start)
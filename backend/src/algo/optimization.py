@@ -2,12 +2,30 @@
 Module containing clustering algorithms and optimization functions.
 """
 
+import time
 import numpy as np
-from sklearn.cluster import KMeans, SpectralClustering
+from sklearn.cluster import KMeans, MiniBatchKMeans, SpectralClustering
 from sklearn.preprocessing import StandardScaler
-from data_processing import createStudentFeatures
-from scoring import evaluateSolution, calculateSatisfactionScore, calculateMovementGain
-from config import MAX_ATTEMPTS, MAX_LOCAL_ITERATIONS
+try:
+    from .data_processing import createStudentFeatures
+    from .scoring import evaluateSolution, calculateSatisfactionScore, calculateMovementGain
+    from .initialization import (greedyMutualSeeding, communityDetectionSeeding, balancedCapacities,
+                                 groupAffinity)
+    from .metrics import timer
+    from .profiling import span
+    from .config import (MAX_ATTEMPTS, MAX_LOCAL_ITERATIONS, ATTEMPT_STRATEGIES,
+                         KMEANS_BACKEND, KMEANS_CANDIDATES, MINIBATCH_THRESHOLD, RANDOM_SEED,
+                        WARM_START_ITERATIONS)
+except ImportError:  # Executed as a script from the algo directory
+    from data_processing import createStudentFeatures
+    from scoring import evaluateSolution, calculateSatisfactionScore, calculateMovementGain
+    from initialization import (greedyMutualSeeding, communityDetectionSeeding, balancedCapacities,
+                                groupAffinity)
+    from metrics import timer
+    from profiling import span
+    from config import (MAX_ATTEMPTS, MAX_LOCAL_ITERATIONS, ATTEMPT_STRATEGIES,
+                        KMEANS_BACKEND, KMEANS_CANDIDATES, MINIBATCH_THRESHOLD, RANDOM_SEED,
+                        WARM_START_ITERATIONS)
 
 
 def isBeneficialMove(groups, affinityMatrix, namesIndex, personIdx, currentGroupIdx, newGroupIdx, targetSize):
@@ -34,13 +52,20 @@ def isBeneficialMove(groups, affinityMatrix, namesIndex, personIdx, currentGroup
     return gain > 0 or newEquityLoss < currentEquityLoss
 
 
-def localOptimization(groups, affinityMatrix, names, targetSize, maxIterations=MAX_LOCAL_ITERATIONS):
-    """Local optimization by exchanges between groups"""
+def localOptimization(groups, affinityMatrix, names, targetSize, maxIterations=MAX_LOCAL_ITERATIONS, stats=None):
+    """
+    Local optimization by exchanges between groups
+
+    If given, the stats dict receives the number of iterations run and of
+    moves accepted.
+    """
     namesIndex = {name: i for i, name in enumerate(names)}
     currentGroups = [group.copy() for group in groups]
+    iterations = moves = 0
     
     for iteration in range(maxIterations):
         improved = False
+        iterations += 1
         
         for groupIdx, group in enumerate(currentGroups):
             for person in group:
@@ -57,6 +82,7 @@ def localOptimization(groups, affinityMatrix, names, targetSize, maxIterations=M
                         currentGroups[groupIdx].remove(person)
                         currentGroups[newGroupIdx].append(person)
                         improved = True
+                        moves += 1
                         break
                 
                 if improved:
@@ -67,6 +93,9 @@ def localOptimization(groups, affinityMatrix, names, targetSize, maxIterations=M
         if not improved:
             break
     
+    if stats is not None:
+        stats["iterations"] = iterations
+        stats["moves"] = moves
     return currentGroups
 
 
@@ -99,10 +128,92 @@ def forceInitialBalance(groups, targetSize):
     return balancedGroups
 
 
-def hybridBalancedClustering(names, affinityMatrix, groupSize, maxAttempts=MAX_ATTEMPTS):
+def labelsToGroups(labels, names, groupCount):
+    """Convert cluster labels to groups of names, dropping empty clusters"""
+    groups = [[] for _ in range(groupCount)]
+    for i, label in enumerate(labels):
+        groups[label].append(names[i])
+    return [group for group in groups if group]
+
+
+def kmeansLabelingStream(features, groupCount, candidates=KMEANS_CANDIDATES,
+                         backend=KMEANS_BACKEND, seed=None, tracer=None):
+    """
+    Lazily runs single-initialization KMeans fits and yields each distinct labeling.
+
+    Instead of letting KMeans keep only the best of its n_init runs, each run is
+    fitted once and its labeling kept as a separate starting point. Fits only
+    run when the next labeling is requested, so callers pay for as many fits as
+    they use, up to candidates.
+
+    Args:
+        features (numpy.ndarray): Scaled student feature vectors
+        groupCount (int): Number of clusters
+        candidates (int): Maximum number of single-initialization fits
+        backend (str): "kmeans", "minibatch" or "auto" (MiniBatchKMeans from MINIBATCH_THRESHOLD students)
+        seed (int or numpy.random.SeedSequence): Seed from which each fit's random state is derived
+        tracer (algo.profiling.Tracer): Receives a span per fit, if given
+
+    Yields:
+        tuple: (labels, inertia) of each labeling not seen before
+    """
+    if backend not in ("kmeans", "minibatch", "auto"):
+        raise ValueError(f"Unknown KMeans backend: {backend}")
+    useMinibatch = backend == "minibatch" or (backend == "auto" and len(features) >= MINIBATCH_THRESHOLD)
+    
+    seedSequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    randomStates = seedSequence.generate_state(candidates).tolist()
+    
+    seen = set()
+    for randomState in randomStates:
+        if useMinibatch:
+            model = MiniBatchKMeans(n_clusters=groupCount, random_state=randomState, n_init=1)
+        else:
+            model = KMeans(n_clusters=groupCount, random_state=randomState, n_init=1)
+        with span(tracer, f"{type(model).__name__}.fit") as record:
+            labels = model.fit_predict(features)
+            record["attributes"]["inertia"] = float(model.inertia_)
+        
+        # Number clusters by first appearance so identical partitions compare equal
+        _, firstSeen, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        canonical = np.argsort(np.argsort(firstSeen))[inverse]
+        key = canonical.tobytes()
+        if key not in seen:
+            seen.add(key)
+            yield labels, model.inertia_
+
+
+def hybridBalancedClustering(names, affinityMatrix, groupSize, maxAttempts=MAX_ATTEMPTS,
+                             strategies=ATTEMPT_STRATEGIES, seed=RANDOM_SEED, progressCallback=None,
+                             metrics=None, tracer=None):
     """
     Hybrid approach combining multiple clustering methods with local optimization
+
+    Each attempt uses the initialization strategy found at its index in
+    strategies (cycled if shorter than maxAttempts): "mutual", "community",
+    "kmeans", "spectral" or "random".
+
+    Every random source draws from its own stream spawned from seed, so two
+    runs with the same integer seed and strategies give the same groups (None
+    draws fresh entropy). The KMeans labelings are shared by the "kmeans"
+    attempts and the spectral fallback and handed out in attempt order, so
+    reordering strategies may change the labeling each attempt starts from.
+
+    If given, progressCallback is called after every attempt with a dict
+    holding the attempt number, the number of attempts, the best score so
+    far (None until a solution exists), the group sizes found by the attempt
+    (None if it was skipped) and the seconds elapsed since the start.
+
+    If given, metrics (an algo.metrics.MetricsRecorder) receives the duration
+    of each phase: "features", "init_<strategy>", "balance",
+    "local_optimization" and "scoring".
+
+    If given, tracer (an algo.profiling.Tracer) receives a span per attempt,
+    nesting spans for feature building, scaling, each KMeans or spectral fit,
+    the seeding, balancing, local optimization (with its iterations and moves
+    accepted) and scoring.
     """
+    startTime = time.perf_counter()
     n = len(names)
     targetGroupCount = max(1, n // groupSize)
     if n % groupSize != 0:
@@ -111,67 +222,190 @@ def hybridBalancedClustering(names, affinityMatrix, groupSize, maxAttempts=MAX_A
     bestSolution = None
     bestScore = -float('inf')
     
-    # Create features for clustering
-    features = createStudentFeatures(names, affinityMatrix)
-    scaler = StandardScaler()
-    scaledFeatures = scaler.fit_transform(features)
+    # Independent random streams: one for the KMeans fits, one per attempt
+    kmeansStream, *attemptStreams = np.random.SeedSequence(seed).spawn(maxAttempts + 1)
+    
+    # KMeans labelings shared by the KMeans attempts and the spectral fallback,
+    # features and fits are only computed when a labeling is needed
+    labelingStream = None
+    
+    def nextKmeansLabeling():
+        nonlocal labelingStream
+        if labelingStream is None:
+            with timer("features", metrics):
+                with span(tracer, "createStudentFeatures"):
+                    features = createStudentFeatures(names, affinityMatrix)
+                with span(tracer, "StandardScaler"):
+                    scaler = StandardScaler()
+                    scaledFeatures = scaler.fit_transform(features)
+            labelingStream = kmeansLabelingStream(scaledFeatures, targetGroupCount, seed=kmeansStream,
+                                                  tracer=tracer)
+        with timer("init_kmeans", metrics):
+            labeling = next(labelingStream, None)
+        return None if labeling is None else labeling[0]
+    
+    def reportProgress(attempt, sizes=None):
+        if progressCallback is not None:
+            progressCallback({
+                "attempt": attempt + 1,
+                "attempts": maxAttempts,
+                "bestScore": float(bestScore) if bestSolution is not None else None,
+                "sizes": sizes,
+                "elapsed": time.perf_counter() - startTime
+            })
     
     print(f" Testing {maxAttempts} different initialization strategies...")
     
     for attempt in range(maxAttempts):
-        currentGroups = None
+        strategy = strategies[attempt % len(strategies)]
+        with span(tracer, "attempt", attempt=attempt + 1, strategy=strategy):
+            rng = np.random.default_rng(attemptStreams[attempt])
         
-        # Try different clustering approaches
-        if attempt < 3:
-            # K-Means with different random states
-            kmeans = KMeans(n_clusters=targetGroupCount, random_state=attempt, n_init=10)
-            labels = kmeans.fit_predict(scaledFeatures)
-            
-        elif attempt < 6:
-            # Spectral clustering with different random states
-            try:
-                spectral = SpectralClustering(
-                    n_clusters=targetGroupCount, 
-                    affinity='precomputed',
-                    random_state=attempt
-                )
-                labels = spectral.fit_predict(affinityMatrix)
-            except:
-                # Fallback to K-means if spectral fails
-                kmeans = KMeans(n_clusters=targetGroupCount, random_state=attempt, n_init=10)
-                labels = kmeans.fit_predict(scaledFeatures)
+            # Try different clustering approaches
+            if strategy == "mutual":
+                # Greedy seeding from the strongest mutual pairs
+                with timer("init_mutual", metrics), span(tracer, "greedyMutualSeeding"):
+                    initialGroups = greedyMutualSeeding(names, affinityMatrix, groupSize)
         
-        else:
-            # Random initialization for diversity
-            labels = np.random.randint(0, targetGroupCount, size=n)
+            elif strategy == "community":
+                # Modularity-based communities of the vote graph, resized to groups
+                with timer("init_community", metrics), span(tracer, "communityDetectionSeeding"):
+                    initialGroups = communityDetectionSeeding(names, affinityMatrix, groupSize)
         
-        # Convert labels to groups
-        initialGroups = [[] for _ in range(targetGroupCount)]
-        for i, label in enumerate(labels):
-            initialGroups[label].append(names[i])
+            elif strategy == "kmeans":
+                # Next distinct K-Means labeling, skipped once they are all used
+                labels = nextKmeansLabeling()
+                if labels is None:
+                    reportProgress(attempt)
+                    continue
+                initialGroups = labelsToGroups(labels, names, targetGroupCount)
+            
+            elif strategy == "spectral":
+                # Spectral clustering with different random states
+                try:
+                    with timer("init_spectral", metrics), span(tracer, "SpectralClustering.fit"):
+                        spectral = SpectralClustering(
+                            n_clusters=targetGroupCount, 
+                            affinity='precomputed',
+                            random_state=int(rng.integers(2**31 - 1))
+                        )
+                        labels = spectral.fit_predict(affinityMatrix)
+                except:
+                    # Fallback to the next K-means labeling if spectral fails
+                    labels = nextKmeansLabeling()
+                    if labels is None:
+                        reportProgress(attempt)
+                        continue
+                initialGroups = labelsToGroups(labels, names, targetGroupCount)
         
-        # Remove empty groups
-        initialGroups = [group for group in initialGroups if group]
+            elif strategy == "random":
+                # Random initialization for diversity
+                with timer("init_random", metrics), span(tracer, "randomLabels"):
+                    labels = rng.integers(0, targetGroupCount, size=n)
+                    initialGroups = labelsToGroups(labels, names, targetGroupCount)
         
-        # Force balance if groups are too uneven
-        initialGroups = forceInitialBalance(initialGroups, groupSize)
+            else:
+                raise ValueError(f"Unknown initialization strategy: {strategy}")
         
-        # Local optimization
-        optimizedGroups = localOptimization(
-            initialGroups, affinityMatrix, names, groupSize, maxIterations=50
-        )
+            # Force balance if groups are too uneven
+            with timer("balance", metrics), span(tracer, "forceInitialBalance"):
+                initialGroups = forceInitialBalance(initialGroups, groupSize)
         
-        # Evaluate solution
-        score = evaluateSolution(optimizedGroups, affinityMatrix, names, groupSize)
-        satisfaction, rawScore = calculateSatisfactionScore(optimizedGroups, affinityMatrix, names)
+            # Local optimization
+            with timer("local_optimization", metrics), span(tracer, "localOptimization") as record:
+                optimizedGroups = localOptimization(
+                    initialGroups, affinityMatrix, names, groupSize, maxIterations=50,
+                    stats=record["attributes"]
+                )
         
-        if score > bestScore:
-            bestScore = score
-            bestSolution = optimizedGroups.copy()
+            # Evaluate solution
+            with timer("scoring", metrics), span(tracer, "scoring"):
+                score = evaluateSolution(optimizedGroups, affinityMatrix, names, groupSize)
+                satisfaction, rawScore = calculateSatisfactionScore(optimizedGroups, affinityMatrix, names)
         
-        # Progress indicator
-        if attempt % 2 == 0:
+            if score > bestScore:
+                bestScore = score
+                bestSolution = optimizedGroups.copy()
+        
+            # Progress indicator
             sizes = [len(g) for g in optimizedGroups]
-            print(f"   Attempt {attempt+1:2d}: Satisfaction {satisfaction:.3f} | Sizes: {sizes}")
+            if attempt % 2 == 0:
+                print(f"   Attempt {attempt+1:2d}: Satisfaction {satisfaction:.3f} | Sizes: {sizes}")
+        
+            reportProgress(attempt, sizes)
     
-    return bestSolution
\ No newline at end of file
+    return bestSolution
+
+
+def repairGrouping(previousGroups, names, affinityMatrix, groupSize):
+    """
+    Adapts a previous grouping to the current list of students.
+
+    Students who left are dropped, then groups are resized to the balanced
+    capacities: surplus groups are dissolved, overfull groups release the members
+    with the least affinity to the rest of their group, and newcomers and released
+    members join the group with room where they have the most affinity.
+
+    Args:
+        previousGroups (list): Previous groups, each containing list of student names
+        names (list): List of all current student names
+        affinityMatrix (numpy.ndarray): Matrix containing affinity scores between students
+        groupSize (int): Target size of each group
+
+    Returns:
+        list: List of groups, each containing list of student names
+    """
+    namesIndex = {name: i for i, name in enumerate(names)}
+    capacities = balancedCapacities(len(names), groupSize)
+    
+    # Keep current students only, each in the first group they appear in
+    placed = set()
+    groups = []
+    for group in previousGroups:
+        members = [namesIndex[name] for name in group if name in namesIndex and name not in placed]
+        placed.update(group)
+        if members:
+            groups.append(members)
+    toPlace = [namesIndex[name] for name in names if name not in placed]
+    
+    # Largest groups get the largest capacities, surplus groups are dissolved
+    groups.sort(key=len, reverse=True)
+    while len(groups) > len(capacities):
+        toPlace.extend(groups.pop())
+    groups.extend([] for _ in range(len(capacities) - len(groups)))
+    
+    for members, capacity in zip(groups, capacities):
+        while len(members) > capacity:
+            weakest = min(members, key=lambda m: groupAffinity(affinityMatrix, m, [o for o in members if o != m]))
+            members.remove(weakest)
+            toPlace.append(weakest)
+    
+    for person in toPlace:
+        bestGroup = max(
+            (g for g in range(len(groups)) if len(groups[g]) < capacities[g]),
+            key=lambda g: (groupAffinity(affinityMatrix, person, groups[g]), capacities[g] - len(groups[g]))
+        )
+        groups[bestGroup].append(person)
+    
+    return [[names[i] for i in members] for members in groups if members]
+
+
+def warmStartClustering(names, affinityMatrix, groupSize, previousGroups, maxIterations=WARM_START_ITERATIONS):
+    """
+    Re-optimizes a previous grouping after minor changes instead of starting over.
+
+    The previous grouping is repaired for added and removed students, then only
+    the local optimization runs, with a small iteration budget.
+
+    Args:
+        names (list): List of all current student names
+        affinityMatrix (numpy.ndarray): Matrix containing affinity scores between students
+        groupSize (int): Target size of each group
+        previousGroups (list): Previous groups, each containing list of student names
+        maxIterations (int): Iteration budget of the local optimization
+
+    Returns:
+        list: List of groups, each containing list of student names
+    """
+    initialGroups = repairGrouping(previousGroups, names, affinityMatrix, groupSize)
+    return localOptimization(initialGroups, affinityMatrix, names, groupSize, maxIterations=maxIterations)
@@ -0,0 +1,99 @@
+"""
+Module providing phase-level profiling of the clustering engine.
+
+A Tracer records nested timed spans, each with a name, its parent spans and
+optional attributes (e.g. iterations run by the local optimization). Spans can
+be exported as JSON or in the folded stack format read by flame graph tools
+(flamegraph.pl, speedscope, inferno).
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Collects the timed spans of a clustering run"""
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Times the enclosed block as a span nested in the currently open ones.
+
+        Args:
+            name (str): Name of the span
+            **attributes: Attributes stored with the span
+
+        Yields:
+            dict: The span, whose "attributes" can be completed inside the block
+        """
+        record = {
+            "name": name,
+            "path": [parent["name"] for parent in self._stack] + [name],
+            "start": time.perf_counter() - self._origin,
+            "duration": None,
+            "attributes": dict(attributes)
+        }
+        self.spans.append(record)
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            record["duration"] = time.perf_counter() - self._origin - record["start"]
+
+    def toJson(self):
+        """
+        Exports the spans as JSON, in the order they were opened.
+
+        Returns:
+            str: JSON array of spans with name, path, start and duration in seconds, and attributes
+        """
+        return json.dumps(self.spans, indent=2, default=float)
+
+    def toFolded(self):
+        """
+        Exports the spans in the folded stack format of flame graphs.
+
+        Each line holds a stack of span names separated by ";" and the time spent
+        in it, excluding its child spans, in microseconds.
+
+        Returns:
+            str: One line per distinct stack
+        """
+        selfTimes = {}
+        for record in self.spans:
+            stack = ";".join(record["path"])
+            selfTimes[stack] = selfTimes.get(stack, 0.0) + record["duration"]
+            if len(record["path"]) > 1:
+                parent = ";".join(record["path"][:-1])
+                selfTimes[parent] = selfTimes.get(parent, 0.0) - record["duration"]
+
+        return "\n".join(
+            f"{stack} {max(0, round(seconds * 1e6))}" for stack, seconds in selfTimes.items()
+        ) + "\n"
+
+
+@contextmanager
+def span(tracer, name, **attributes):
+    """
+    Opens a span on tracer, or does nothing if tracer is None.
+
+    Args:
+        tracer (Tracer): The tracer receiving the span, may be None
+        name (str): Name of the span
+        **attributes: Attributes stored with the span
+
+    Yields:
+        dict: The span record (a throwaway dict without tracer)
+    """
+    if tracer is None:
+        yield {"attributes": {}}
+        return
+    with tracer.span(name, **attributes) as record:
+        yield record
@@ -7,7 +7,10 @@ evaluating overall solutions, and calculating potential gains from group changes
 """
 
 import numpy as np
-from config import TOTAL_POINTS, MUTUAL_BONUS, EQUITY_WEIGHT, SATISFACTION_WEIGHT
+try:
+    from .config import TOTAL_POINTS, MUTUAL_BONUS, EQUITY_WEIGHT, SATISFACTION_WEIGHT
+except ImportError:  # Executed as a script from the algo directory
+    from config import TOTAL_POINTS, MUTUAL_BONUS, EQUITY_WEIGHT, SATISFACTION_WEIGHT
 
 
 def calculateSatisfactionScore(groups, affinityMatrix, names):
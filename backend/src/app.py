@@ -9,9 +9,11 @@ and provides utility functions for accessing the application instance.
 from flask import Flask, jsonify, redirect, current_app
 from flask_restful import Api
 from flask_cors import CORS
-from extensions import db  # Importer db depuis extensions
+from extensions import db, configure_engine  # Importer db depuis extensions
 import os
-from config.config import config
+from config.config import config, engine_options
+from instrumentation import init_instrumentation
+from services.metrics_service import init_metrics
 from dotenv import load_dotenv
 
 # Global variable to store the application instance
@@ -29,12 +31,14 @@ def get_app():
         return _app
     return current_app
 
-def create_app(config_name='default'):
+def create_app(config_name='default', test_config=None):
     """
     Application factory function that creates and configures the Flask application.
     
     Args:
         config_name (str): The configuration to use ('development', 'testing', 'production')
+        test_config (dict): Settings overriding the configuration, applied before
+            extensions are initialized (e.g. a per-test database URI)
         
     Returns:
         Flask: The configured Flask application instance
@@ -50,9 +54,19 @@ def create_app(config_name='default'):
     # Load configuration
     app_config = config[config_name]
     app.config.from_object(app_config)
+    if test_config:
+        app.config.update(test_config)
+    
+    # Engine options derived from the database in use, explicit ones take precedence
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
     
     # Initialize extensions with app
     db.init_app(app)
+    configure_engine(app)
+    init_instrumentation(app)
+    init_metrics(app)
     CORS(app)
     
     # Initialize API
@@ -62,10 +76,9 @@ def create_app(config_name='default'):
     from routes import register_routes
     register_routes(app, api)
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
-
+    # Schema creation is an explicit command, startup runs no DDL
+    from models.create_db import init_db_command
+    app.cli.add_command(init_db_command)
 
     # Register error handlers
     @app.errorhandler(404)
@@ -0,0 +1,58 @@
+"""
+Benchmark of service calls made outside of a request.
+
+Compares a loop of service calls each pushing its own app context with the
+same loop run inside a single service_scope.
+
+Usage (from backend/src):
+    python benchmarks/service_scope.py [--calls 10000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from extensions import db
+from models.student import Student
+from services.student_service import StudentService
+from services.utils import service_scope
+
+def run(calls):
+    """Times the calls per context and within one scope and prints the results."""
+    db_fd, db_path = tempfile.mkstemp()
+    try:
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        with app.app_context():
+            db.create_all()
+            student = Student(student_email='benchmark@test.com')
+            db.session.add(student)
+            db.session.commit()
+            student_id = student.student_id
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            StudentService.get_student(student_id)
+        per_call = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with service_scope(app):
+            for _ in range(calls):
+                StudentService.get_student(student_id)
+        scoped = time.perf_counter() - start
+
+        print(f"{calls} calls, one context per call: {per_call:.3f}s ({per_call / calls * 1e6:.1f}us/call)")
+        print(f"{calls} calls, one service scope:    {scoped:.3f}s ({scoped / calls * 1e6:.1f}us/call)")
+        print(f"Speedup: {per_call / scoped:.2f}x")
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=10000, help='Number of service calls per loop')
+    run(parser.parse_args().calls)
@@ -0,0 +1,58 @@
+"""
+Benchmark of the API startup.
+
+Times create_app() in fresh interpreters, so that module imports are counted,
+and reports the peak memory of the process and whether the scientific stack
+was loaded. Importing the clustering engine afterwards shows what the first
+clustering request pays instead.
+
+Usage (from backend/src):
+    python benchmarks/startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app('testing', {'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+startup = time.perf_counter() - start
+loaded = [name for name in ('numpy', 'scipy', 'sklearn', 'pandas') if name in sys.modules]
+memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+import algo.optimization, algo.scoring, algo.data_processing
+engine = time.perf_counter() - start
+print(json.dumps({'startup': startup, 'loaded': loaded, 'memory_kb': memory, 'engine': engine}))
+"""
+
+def probe():
+    """Runs create_app in a fresh interpreter and returns its measurements."""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(runs):
+    """Probes the startup several times and prints the median measurements."""
+    results = [probe() for _ in range(runs)]
+    startup = statistics.median(result['startup'] for result in results)
+    engine = statistics.median(result['engine'] for result in results)
+    memory = statistics.median(result['memory_kb'] for result in results)
+
+    print(f"create_app(): {startup * 1000:.0f}ms (median of {runs} runs)")
+    print(f"Peak memory after startup: {memory / 1024:.0f}MB")
+    print(f"Scientific modules loaded at startup: {results[0]['loaded'] or 'none'}")
+    print(f"First clustering import of the engine: {engine * 1000:.0f}ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to time')
+    run(parser.parse_args().runs)
@@ -1,14 +1,37 @@
 import os
+from dotenv import load_dotenv
+
+# Load .env before the settings below read the environment
+load_dotenv()
 
 class Config:
     """Base configuration."""
     DEBUG = False
     TESTING = False
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')  # Added default for dev
-    # Use SQLite as an internal database
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///app.db'
+    # Use SQLite as an internal database unless DATABASE_URL points elsewhere (e.g. mysql+pymysql://...)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool, for server databases such as MySQL
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))  # Connections kept open
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))  # Extra connections allowed during peaks
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # Seconds before a connection is replaced, below MySQL's wait_timeout
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    
+    # SQLite pragmas, applied to each new connection
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')  # Readers no longer block the writer
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # Safe with WAL, one fsync per checkpoint
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Milliseconds to wait for a lock instead of failing
+    
+    # SQL instrumentation
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')  # Count and time statements per request
+    SQL_INSTRUMENTATION_HEADERS = False  # Send X-SQL-Count and X-SQL-Time-Ms response headers
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))  # Statements slower than this are logged
+    
+    # Prometheus metrics served at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    
     # Session configuration
     SESSION_TYPE = 'filesystem'
     
@@ -18,6 +41,26 @@ class Config:
     
     # Pagination
     ITEMS_PER_PAGE = 20
+    MAX_ITEMS_PER_PAGE = 500
+    STREAM_BATCH_SIZE = 1000  # Rows fetched at a time by NDJSON exports
+    
+    # Authentication
+    AUTH_REQUIRED = False  # Reject requests without a token on protected endpoints
+    TOKEN_CACHE_SIZE = 1024  # Decoded tokens kept in memory
+    TOKEN_CACHE_TTL = 300  # Seconds a decoded token is trusted without decoding it again
+    
+    # Password hashing
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # Full Werkzeug method, older hashes are upgraded on login
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))  # Threads hashing passwords concurrently
+    
+    # Batch imports
+    BATCH_CHUNK_SIZE = 500  # Values per IN query when checking existing rows
+    
+    # Clustering
+    CLUSTERING_SEED = 0  # Default seed so that a formular's groups are reproducible
+    CLUSTERING_WORKERS = 2  # Worker threads running background clustering jobs
+    CLUSTERING_JOB_TTL = 3600  # Seconds a finished job stays available
+    CLUSTERING_EVENTS_KEEP_ALIVE = 15  # Seconds between keep-alive comments of a progress stream
     
     # Uncomment if using Flask-Mail
     # MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.example.com')
@@ -32,15 +75,42 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
+    SQL_INSTRUMENTATION = True
+    SQL_INSTRUMENTATION_HEADERS = True
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test_database.db'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # Cheap hashes keep the tests fast
 
 class ProductionConfig(Config):
     """Production configuration."""
     # Production specific settings
+    AUTH_REQUIRED = True
+
+def engine_options(settings):
+    """
+    Builds the SQLAlchemy engine options matching the configured database.
+    
+    Server databases get a sized connection pool that pings connections before use
+    and recycles them; SQLite gets a busy timeout, its pragmas being set on connect.
+    
+    Args:
+        settings (dict): The application configuration
+        
+    Returns:
+        dict: Options for SQLALCHEMY_ENGINE_OPTIONS
+    """
+    if settings['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return {'connect_args': {'timeout': settings['SQLITE_BUSY_TIMEOUT'] / 1000}}
+    return {
+        'pool_size': settings['DB_POOL_SIZE'],
+        'max_overflow': settings['DB_MAX_OVERFLOW'],
+        'pool_recycle': settings['DB_POOL_RECYCLE'],
+        'pool_timeout': settings['DB_POOL_TIMEOUT'],
+        'pool_pre_ping': True
+    }
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,76 @@
+"""
+SQL Instrumentation Module.
+
+This module counts and times the SQL statements issued while handling each
+request, through SQLAlchemy engine events and Flask request hooks. Totals are
+logged per request and, when enabled, sent back in response headers; statements
+slower than SLOW_QUERY_THRESHOLD_MS are logged as warnings.
+
+Nothing is registered unless SQL_INSTRUMENTATION is set, so a disabled
+instrumentation costs nothing.
+"""
+
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from extensions import db
+
+def init_instrumentation(app):
+    """
+    Registers the SQL instrumentation hooks on an application.
+
+    Args:
+        app (Flask): The application, with db already initialized
+    """
+    if not app.config['SQL_INSTRUMENTATION']:
+        return
+
+    threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+    send_headers = app.config['SQL_INSTRUMENTATION_HEADERS']
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+
+        if has_request_context() and 'sql_count' in g:
+            g.sql_count += 1
+            g.sql_time += elapsed
+
+        if elapsed >= threshold:
+            app.logger.warning('Slow query (%.1fms): %s', elapsed * 1000, ' '.join(statement.split()))
+            if has_request_context() and 'sql_slow' in g:
+                g.sql_slow += 1
+
+    @event.listens_for(engine, 'handle_error')
+    def discard_timer(context):
+        # A failed statement never reaches after_cursor_execute, drop its start time
+        # so that the pooled connection does not accumulate them
+        if context.connection is not None and context.connection.info.get('query_start'):
+            context.connection.info['query_start'].pop()
+
+    @app.before_request
+    def reset_counters():
+        g.sql_count = 0
+        g.sql_time = 0.0
+        g.sql_slow = 0
+
+    @app.after_request
+    def report_counters(response):
+        if 'sql_count' not in g:
+            return response
+
+        app.logger.info(
+            '%s %s: %d SQL statements in %.1fms (%d slow)',
+            request.method, request.path, g.sql_count, g.sql_time * 1000, g.sql_slow
+        )
+        if send_headers:
+            response.headers['X-SQL-Count'] = str(g.sql_count)
+            response.headers['X-SQL-Time-Ms'] = f'{g.sql_time * 1000:.1f}'
+        return response
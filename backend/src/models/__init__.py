@@ -5,6 +5,7 @@ from models.formular import Formular
 from models.teacher import Teacher
 from models.user_role import UserRole
 from models.vote import Vote
+from models.clustering_result import ClusteringResult
 
 __all__ = [
     'Student',
@@ -13,5 +14,6 @@ __all__ = [
     'Formular',
     'Teacher',
     'UserRole',
-    'Vote'
+    'Vote',
+    'ClusteringResult'
 ]
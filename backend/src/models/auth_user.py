@@ -25,7 +25,7 @@ class AuthUser(db.Model):
     __tablename__ = 'auth_user'
     
     auth_user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    auth_user_email = db.Column(db.String(255), nullable=False)
+    auth_user_email = db.Column(db.String(255), nullable=False, index=True)
     auth_user_mdp = db.Column(db.String(255), nullable=False)
     auth_user_name = db.Column(db.String(100), nullable=False)
     auth_user_firstname = db.Column(db.String(100), nullable=False)
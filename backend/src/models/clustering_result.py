@@ -0,0 +1,38 @@
+"""
+Clustering Result Model.
+
+This module defines the ClusteringResult model which caches the groups
+generated for a formular, so that they are not recomputed on every request.
+"""
+
+from extensions import db
+from datetime import datetime
+
+class ClusteringResult(db.Model):
+    """
+    ClusteringResult database model for caching clustering responses.
+    
+    A result is identified by its formular and a cache key hashing the group size,
+    the seed, the algorithm configuration and a fingerprint of the formular's votes.
+    
+    Attributes:
+        clustering_result_id (int): Primary key, unique identifier for the result
+        clustering_result_formid (int): The ID of the clustered formular
+        clustering_result_key (str): SHA-256 cache key of the clustering inputs
+        clustering_result_data (str): JSON encoded clustering response
+        clustering_result_created (datetime): Date at which the result was computed
+    """
+    __tablename__ = 'clustering_result'
+    __table_args__ = (
+        db.UniqueConstraint('clustering_result_formid', 'clustering_result_key', name='uq_clustering_result_key'),
+    )
+    
+    clustering_result_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    clustering_result_formid = db.Column(db.Integer, db.ForeignKey('formular.formular_id'), nullable=False)
+    clustering_result_key = db.Column(db.String(64), nullable=False)
+    clustering_result_data = db.Column(db.Text, nullable=False)
+    clustering_result_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        """String representation of the ClusteringResult object."""
+        return f'<ClusteringResult {self.clustering_result_formid}:{self.clustering_result_key[:8]}>'
@@ -6,10 +6,16 @@ from models.teacher import Teacher
 from models.formular import Formular
 from models.vote import Vote
 from models.user_role import UserRole
+from models.clustering_result import ClusteringResult
+import click
 from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+
+DEFAULT_ROLES = ["admin", "teacher", "student"]
 
 def init_db(app=None):
-    """Initialize the database with tables"""
+    """Initialize the database with tables and the default roles, safe to run several times"""
     if app is None:
         # If no app is provided, try to use the current_app
         app = current_app
@@ -17,20 +23,70 @@ def init_db(app=None):
     with app.app_context():
         db.create_all()
         
-        # Create default roles
-        admin_role = Role(role_name="admin")
-        teacher_role = Role(role_name="teacher") 
-        student_role = Role(role_name="student")
-        
-        db.session.add_all([admin_role, teacher_role, student_role])
+        # Create the default roles that do not exist yet
+        existing = {name for (name,) in db.session.query(Role.role_name)}
+        missing = [Role(role_name=name) for name in DEFAULT_ROLES if name not in existing]
+        db.session.add_all(missing)
         db.session.commit()
-
-    
     
     print("Database initialized successfully")
 
+def migrate_db(app=None):
+    """
+    Bring an existing database up to date with the models.
+
+    Creates missing tables, removes duplicate votes (keeping the latest one)
+    so that the unique vote index can be built, printing how many were removed
+    for which (form, voter, student) triples, then creates every index
+    declared on the models that the database does not have yet. Safe to run
+    several times, on SQLite as well as MySQL.
+    """
+    if app is None:
+        app = current_app
+
+    with app.app_context():
+        db.create_all()
+
+        duplicates = db.session.execute(text(
+            "SELECT vote_formid, vote_userid, vote_studentid, COUNT(*) FROM vote "
+            "GROUP BY vote_formid, vote_userid, vote_studentid HAVING COUNT(*) > 1 "
+            "ORDER BY vote_formid, vote_userid, vote_studentid"
+        )).all()
+        if duplicates:
+            # The derived table lets MySQL select from the table it deletes from
+            db.session.execute(text(
+                "DELETE FROM vote WHERE vote_idvote NOT IN ("
+                "SELECT keep_id FROM (SELECT MAX(vote_idvote) AS keep_id FROM vote "
+                "GROUP BY vote_userid, vote_formid, vote_studentid) AS latest_votes)"
+            ))
+            db.session.commit()
+
+            removed = sum(count - 1 for *_, count in duplicates)
+            print(f"Removed {removed} duplicate votes, keeping the latest of each:")
+            for form_id, voter_id, student_id, count in duplicates:
+                print(f"  form {form_id}, voter {voter_id}, student {student_id}: {count} votes")
+
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(db.engine)
+                    print(f"Created index {index.name}")
+
+    print("Database migrated successfully")
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create the tables, seed the default roles and migrate the schema."""
+    app = current_app._get_current_object()
+    init_db(app)
+    migrate_db(app)
+
 if __name__ == "__main__":
     # When run directly, import app and use it
     from app import create_app
     app = create_app()
     init_db(app)
+    migrate_db(app)
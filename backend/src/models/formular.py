@@ -14,6 +14,8 @@ class Formular(db.Model):
     
     # Relationships
     votes = db.relationship('Vote', backref='formular', lazy=True)
+    clustering_results = db.relationship('ClusteringResult', backref='formular', lazy=True,
+                                         cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Formular {self.formular_title}>'
@@ -2,11 +2,17 @@ from extensions import db
 
 class Vote(db.Model):
     __tablename__ = 'vote'
+    __table_args__ = (
+        # Votes of a form, and of a user in a form (also serves lookups by form alone)
+        db.Index('ix_vote_formid_userid', 'vote_formid', 'vote_userid'),
+        # A user votes at most once for a student in a form (also serves lookups by user)
+        db.Index('uq_vote_user_form_student', 'vote_userid', 'vote_formid', 'vote_studentid', unique=True),
+    )
     
     vote_idvote = db.Column(db.Integer, primary_key=True, autoincrement=True)
     vote_userid = db.Column(db.Integer, db.ForeignKey('auth_user.auth_user_id'), nullable=False)
     vote_formid = db.Column(db.Integer, db.ForeignKey('formular.formular_id'), nullable=False)
-    vote_studentid = db.Column(db.Integer, db.ForeignKey('student.student_id'), nullable=False)
+    vote_studentid = db.Column(db.Integer, db.ForeignKey('student.student_id'), nullable=False, index=True)
     weigth = db.Column(db.Integer, nullable=False)
     
     def __repr__(self):
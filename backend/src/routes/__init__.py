@@ -14,6 +14,7 @@ from .role import registerRoleRoutes
 from .formular import registerFormularRoutes
 from .vote import registerVoteRoutes
 from .clustering import registerClusteringRoutes
+from .metrics import registerMetricsRoutes
 
 def register_routes(app, api):
     """
@@ -34,4 +35,5 @@ def register_routes(app, api):
     registerFormularRoutes(api)
     registerVoteRoutes(api)
     registerClusteringRoutes(api)
+    registerMetricsRoutes(api)
 
@@ -1,7 +1,11 @@
 from flask_restful import Resource
+from services.token_service import auth_required, stream_auth_required
 from services.clustering_service import ClusteringService
+from services.clustering_job_service import ClusteringJobService
 
 class ClusteringResource(Resource):
+    method_decorators = [auth_required]
+    
     def get(self, formular_id):
         """
         Generate student clusters based on votes for a specific formular.
@@ -14,5 +18,38 @@ class ClusteringResource(Resource):
         """
         return ClusteringService.get_clustering_for_formular(formular_id)
 
+class ClusteringJobListResource(Resource):
+    method_decorators = [auth_required]
+    
+    def post(self, formular_id):
+        """
+        Creates a background clustering job for a formular.
+        """
+        return ClusteringJobService.create_job(formular_id)
+
+class ClusteringJobResource(Resource):
+    method_decorators = [auth_required]
+    
+    def get(self, job_id):
+        """
+        Retrieves the status, progress and result of a clustering job.
+        """
+        job = ClusteringJobService.get_job(job_id)
+        if job:
+            return job
+        return {'error': 'Job not found'}, 404
+
+class ClusteringJobEventsResource(Resource):
+    method_decorators = [stream_auth_required]
+    
+    def get(self, job_id):
+        """
+        Streams the progress of a clustering job as server-sent events.
+        """
+        return ClusteringJobService.stream_job_events(job_id)
+
 def registerClusteringRoutes(api):
     api.add_resource(ClusteringResource, '/clustering/<int:formular_id>')
+    api.add_resource(ClusteringJobListResource, '/clustering/<int:formular_id>/jobs')
+    api.add_resource(ClusteringJobResource, '/clustering/jobs/<string:job_id>')
+    api.add_resource(ClusteringJobEventsResource, '/clustering/jobs/<string:job_id>/events')
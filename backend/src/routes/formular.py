@@ -1,5 +1,6 @@
 from flask_restful import Resource
 from services.formular_service import FormularService
+from services.utils import conditional_get, content_etag
 
 class FormularResource(Resource):
     def get(self, formular_id=None):
@@ -9,7 +10,9 @@ class FormularResource(Resource):
         if formular_id:
             formular = FormularService.get_formular(formular_id)
             if formular:
-                return formular
+                # The tag is hashed from the serialized formular: a 304 only saves the
+                # body, the primary-key lookup and serialization still run
+                return conditional_get(content_etag(formular), lambda: formular)
             return {'error': 'Formular not found'}, 404
         else:
             return FormularService.get_all_formular()
@@ -0,0 +1,12 @@
+from flask_restful import Resource
+from services.metrics_service import MetricsService
+
+class MetricsResource(Resource):
+    def get(self):
+        """
+        Exposes the metrics of the application in the Prometheus text format.
+        """
+        return MetricsService.render_metrics()
+
+def registerMetricsRoutes(api):
+    api.add_resource(MetricsResource, '/metrics')
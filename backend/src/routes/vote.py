@@ -1,7 +1,11 @@
 from flask_restful import Resource
+from services.token_service import auth_required
 from services.vote_service import VoteService
+from services.utils import conditional_get
 
 class VoteResource(Resource):
+    method_decorators = [auth_required]
+    
     def get(self, vote_id=None):
         """
         Retrieves a vote by ID, or all votes if no ID is specified.
@@ -26,7 +30,18 @@ class VoteResource(Resource):
         """
         return VoteService.delete_vote(vote_id)
 
+class VoteBatchResource(Resource):
+    method_decorators = [auth_required]
+    
+    def post(self):
+        """
+        Saves a user's whole ballot for a form in a single request.
+        """
+        return VoteService.create_votes_batch()
+
 class UserVoteResource(Resource):
+    method_decorators = [auth_required]
+    
     def get(self, user_id):
         """
         Retrieves all votes made by a specific user.
@@ -34,13 +49,18 @@ class UserVoteResource(Resource):
         return VoteService.get_votes_by_user(user_id)
 
 class FormVoteResource(Resource):
+    method_decorators = [auth_required]
+    
     def get(self, form_id):
         """
-        Retrieves all votes for a specific form.
+        Retrieves all votes for a specific form, tagged with their fingerprint.
         """
-        return VoteService.get_votes_by_form(form_id)
+        return conditional_get(
+            VoteService.vote_fingerprint(form_id), lambda: VoteService.get_votes_by_form(form_id)
+        )
 
 def registerVoteRoutes(api):
     api.add_resource(VoteResource, '/votes', '/votes/<int:vote_id>')
+    api.add_resource(VoteBatchResource, '/votes/batch')
     api.add_resource(UserVoteResource, '/users/<int:user_id>/votes')
     api.add_resource(FormVoteResource, '/formulars/<int:form_id>/votes')
@@ -12,12 +12,13 @@ from datetime import datetime, timedelta
 from models.auth_user import AuthUser
 from models.student import Student
 from models.teacher import Teacher
-from models.role import Role
 from models.user_role import UserRole
 from extensions import db
+from sqlalchemy import select, exists
 import re
-from werkzeug.security import generate_password_hash, check_password_hash
 from services.utils import ensure_app_context
+from services.role_service import RoleService
+from services.password_service import PasswordService
 
 class AuthService:
     """
@@ -105,21 +106,22 @@ class AuthService:
         if not AuthService.validate_password(password):
             return {'error': 'Password must be at least 8 characters and contain uppercase, lowercase, and numbers'}, 400
         
-        # Check if user already exists
-        existing_user = AuthUser.query.filter_by(auth_user_email=email).first()
+        # Check the user, student and teacher tables in a single round trip
+        existing_user, student, teacher = db.session.execute(select(
+            exists().where(AuthUser.auth_user_email == email),
+            exists().where(Student.student_email == email),
+            exists().where(Teacher.teacher_email == email)
+        )).one()
+        
         if existing_user:
             return {'error': 'Email already registered'}, 409
         
-        # Check if email exists in student or teacher tables
-        student = Student.query.filter_by(student_email=email).first()
-        teacher = Teacher.query.filter_by(teacher_email=email).first()
-        
         if not student and not teacher:
             return {'error': 'Email not authorized for registration'}, 403
         
         # Create new user
         try:
-            hashed_password = generate_password_hash(password)
+            hashed_password = PasswordService.hash_password(password)
             new_user = AuthUser(
                 auth_user_email=email,
                 auth_user_mdp=hashed_password,
@@ -131,14 +133,15 @@ class AuthService:
             
             # Assign role based on which table the email was found in
             role_name = 'teacher' if teacher else 'student'
-            role = Role.query.filter_by(role_name=role_name).first()
+            role_id = RoleService.role_id(role_name)
             
-            if not role:
+            if not role_id:
+                db.session.rollback()
                 return {'error': f'Role {role_name} not found'}, 500
                 
             user_role = UserRole(
                 user_role_userid=new_user.auth_user_id,
-                user_role_roleid=role.role_id
+                user_role_roleid=role_id
             )
             db.session.add(user_role)
             db.session.commit()
@@ -188,15 +191,21 @@ class AuthService:
             if not AuthService.validate_email(email):
                 return {'error': 'Invalid email format'}, 400
             
-            # Find user
-            user = AuthUser.query.filter_by(auth_user_email=email).first()
-            if not user or not check_password_hash(user.auth_user_mdp, password):
+            # Find user and role ID in one joined query
+            row = db.session.query(AuthUser, UserRole.user_role_roleid).outerjoin(
+                UserRole, UserRole.user_role_userid == AuthUser.auth_user_id
+            ).filter(AuthUser.auth_user_email == email).first()
+            user, role_id = row if row else (None, None)
+            if not user or not PasswordService.verify_password(user.auth_user_mdp, password):
                 return {'error': 'Invalid email or password'}, 401
             
-            # Get user role
-            user_role = UserRole.query.filter_by(user_role_userid=user.auth_user_id).first()
-            role = Role.query.get(user_role.user_role_roleid) if user_role else None
-            role_name = role.role_name if role else 'unknown'
+            # Upgrade hashes made with older parameters now that the password is known
+            if PasswordService.needs_rehash(user.auth_user_mdp):
+                user.auth_user_mdp = PasswordService.hash_password(password)
+                db.session.commit()
+            
+            # Resolve the role name from the in-process cache
+            role_name = RoleService.role_name(role_id) or 'unknown'
             
             # Generate JWT token
             token_expiration = datetime.utcnow() + timedelta(hours=24)
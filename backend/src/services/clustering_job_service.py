@@ -0,0 +1,255 @@
+"""
+Clustering Job Service Module.
+
+This module runs clustering requests as background jobs on a local worker pool,
+so that long clusterings do not tie up a request thread. Jobs are kept in memory
+and can be polled for their status, progress and result, or followed through a
+server-sent events stream.
+"""
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import request, current_app, Response
+from models.formular import Formular
+from services.clustering_service import ClusteringService
+from services.utils import ensure_app_context
+
+class ClusteringJob:
+    """
+    State of a clustering job, shared between the worker running it and the API.
+
+    Attributes:
+        job_id (str): Unique identifier of the job
+        formular_id (int): The ID of the formular being clustered
+        group_size (int): Requested group size, None for the formular's one
+        seed (int): Requested seed, None for the default one
+        status (str): 'pending', 'running', 'done' or 'failed'
+        progress (dict): Attempts done, total attempts, best score so far, group sizes
+            of the last attempt and seconds elapsed
+        result (dict): Response of the clustering once the job is done
+    """
+
+    def __init__(self, formular_id, group_size=None, seed=None):
+        self.job_id = uuid.uuid4().hex
+        self.formular_id = formular_id
+        self.group_size = group_size
+        self.seed = seed
+        self.status = 'pending'
+        self.progress = {'attempt': 0, 'attempts': None, 'best_score': None, 'sizes': None, 'elapsed': 0.0}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._events = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def start(self):
+        """Marks the job as running."""
+        with self._lock:
+            self.status = 'running'
+
+    def update_progress(self, progress):
+        """Records the progress reported by the clustering engine after each attempt."""
+        with self._lock:
+            self.progress = {
+                'attempt': progress['attempt'],
+                'attempts': progress['attempts'],
+                'best_score': progress['bestScore'],
+                'sizes': progress['sizes'],
+                'elapsed': progress['elapsed']
+            }
+            self._events.append(dict(self.progress))
+            self._changed.notify_all()
+
+    def finish(self, status, result=None, error=None):
+        """Marks the job as done or failed."""
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait_for_events(self, cursor, timeout):
+        """
+        Waits until progress events past cursor exist or the job is finished.
+
+        Args:
+            cursor (int): Number of events already consumed
+            timeout (float): Maximum number of seconds to wait
+
+        Returns:
+            tuple: (events, finished) with the new progress events and whether the job is over
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(self._events) > cursor or self.finished_at is not None, timeout
+            )
+            return self._events[cursor:], self.finished_at is not None
+
+    def to_dict(self):
+        """
+        Convert the job to a dictionary.
+
+        Returns:
+            dict: Dictionary containing the job state, with its result once done
+        """
+        with self._lock:
+            data = {
+                'job_id': self.job_id,
+                'formular_id': self.formular_id,
+                'status': self.status,
+                'progress': dict(self.progress)
+            }
+            if self.result is not None:
+                data['result'] = self.result
+            if self.error is not None:
+                data['error'] = self.error
+            return data
+
+class ClusteringJobService:
+    """
+    Service class for handling background clustering jobs.
+
+    Each application gets its own worker pool of CLUSTERING_WORKERS threads and
+    its own job registry; finished jobs are forgotten after CLUSTERING_JOB_TTL seconds.
+    """
+
+    @staticmethod
+    def _registry():
+        """Returns the worker pool and job registry of the current application."""
+        app = current_app._get_current_object()
+        registry = app.extensions.get('clustering_jobs')
+        if registry is None:
+            registry = app.extensions.setdefault('clustering_jobs', {
+                'executor': ThreadPoolExecutor(
+                    max_workers=app.config['CLUSTERING_WORKERS'],
+                    thread_name_prefix='clustering'
+                ),
+                'jobs': {},
+                'lock': threading.Lock()
+            })
+        return registry
+
+    @staticmethod
+    def _run_job(app, job):
+        """Executes a job on a worker thread, within its own app context."""
+        with app.app_context():
+            job.start()
+            try:
+                result, status_code = ClusteringService.compute_clustering(
+                    job.formular_id, job.group_size, job.seed, progress_callback=job.update_progress
+                )
+                if status_code == 200:
+                    job.finish('done', result=result)
+                else:
+                    job.finish('failed', error=result.get('message'))
+            except Exception as e:
+                job.finish('failed', error=str(e))
+
+    @staticmethod
+    @ensure_app_context
+    def create_job(formular_id):
+        """
+        Creates a clustering job for a formular and queues it on the worker pool.
+
+        Accepts an optional JSON body with 'group_size' and 'seed' fields.
+
+        Args:
+            formular_id (int): The ID of the formular to cluster
+
+        Returns:
+            tuple: A tuple containing (response_data, status_code)
+            - response_data is the job state or an error message
+            - status_code is the HTTP status code (202 for accepted, 400 for invalid fields)
+        """
+        data = request.get_json(silent=True) or {}
+        group_size = data.get('group_size')
+        seed = data.get('seed')
+
+        error = ClusteringService.validate_inputs(group_size, seed)
+        if error:
+            return {'error': error}, 400
+
+        if not Formular.query.get(formular_id):
+            return {'error': 'Formular not found'}, 404
+
+        registry = ClusteringJobService._registry()
+        ttl = current_app.config['CLUSTERING_JOB_TTL']
+        job = ClusteringJob(formular_id, group_size, seed)
+
+        with registry['lock']:
+            now = time.time()
+            expired = [job_id for job_id, other in registry['jobs'].items()
+                       if other.finished_at is not None and now - other.finished_at > ttl]
+            for job_id in expired:
+                del registry['jobs'][job_id]
+            registry['jobs'][job.job_id] = job
+
+        registry['executor'].submit(
+            ClusteringJobService._run_job, current_app._get_current_object(), job
+        )
+        return job.to_dict(), 202
+
+    @staticmethod
+    def _event_stream(job, keep_alive):
+        """Yields the progress of a job as server-sent events, then its final state."""
+        cursor = 0
+        while True:
+            events, finished = job.wait_for_events(cursor, keep_alive)
+            for event in events:
+                yield f'event: progress\ndata: {json.dumps(event)}\n\n'
+            cursor += len(events)
+            if finished:
+                state = job.to_dict()
+                yield f"event: {state['status']}\ndata: {json.dumps(state)}\n\n"
+                return
+            if not events:
+                yield ': keep-alive\n\n'
+
+    @staticmethod
+    @ensure_app_context
+    def stream_job_events(job_id):
+        """
+        Streams the progress of a job as server-sent events.
+
+        Each attempt of the clustering emits a 'progress' event, and the stream
+        ends with a 'done' or 'failed' event carrying the final job state.
+
+        Args:
+            job_id (str): The ID of the job
+
+        Returns:
+            Response: A text/event-stream response, or an error tuple if the job is unknown
+        """
+        job = ClusteringJobService._registry()['jobs'].get(job_id)
+        if not job:
+            return {'error': 'Job not found'}, 404
+
+        keep_alive = current_app.config['CLUSTERING_EVENTS_KEEP_ALIVE']
+        return Response(
+            ClusteringJobService._event_stream(job, keep_alive),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @staticmethod
+    @ensure_app_context
+    def get_job(job_id):
+        """
+        Retrieves the status, progress and result of a job.
+
+        Args:
+            job_id (str): The ID of the job
+
+        Returns:
+            dict: The job state if found, None otherwise
+        """
+        job = ClusteringJobService._registry()['jobs'].get(job_id)
+        if job:
+            return job.to_dict()
+        return None
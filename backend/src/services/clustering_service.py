@@ -1,57 +1,281 @@
 """
 Service for clustering operations.
 Handles the interaction between the clustering algorithm and the API.
+
+The clustering engine and its scientific stack (NumPy, SciPy, scikit-learn)
+are only imported by the methods running it, so that processes which never
+cluster start fast and stay small.
 """
 
-from flask import request
-from algo.config import GROUP_SIZE, TOTAL_POINTS, MAX_ATTEMPTS
-# Importez ici votre algorithme de clustering si nécessaire
-# from algo.clustering import perform_clustering
+from flask import request, current_app
+import hashlib
+import json
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.clustering_result import ClusteringResult
+from models.formular import Formular
+from algo import config as algo_config
+from services.utils import ensure_app_context, conditional_get
+from services.vote_service import VoteService
+from services.metrics_service import MetricsService
 
 class ClusteringService:
     """
     Service for handling clustering operations.
     Provides methods to generate student clusters based on votes and preferences.
     """
-    
+
+    # Algorithm settings that change the generated groups, part of the cache key
+    ALGORITHM_SETTINGS = [
+        'MAX_ATTEMPTS', 'ATTEMPT_STRATEGIES', 'MAX_LOCAL_ITERATIONS', 'KMEANS_BACKEND',
+        'KMEANS_CANDIDATES', 'MINIBATCH_THRESHOLD', 'TOTAL_POINTS', 'MUTUAL_BONUS',
+        'UNILATERAL_WEIGHT', 'EQUITY_WEIGHT', 'SATISFACTION_WEIGHT'
+    ]
+
+    @staticmethod
+    def cache_key(formular_id, group_size, seed, fingerprint):
+        """
+        Hashes every input of a clustering into its cache key.
+
+        Args:
+            formular_id (int): The ID of the formular
+            group_size (int): Size of the groups
+            seed (int): Seed of the clustering
+            fingerprint (str): Fingerprint of the formular's votes
+
+        Returns:
+            str: Hexadecimal SHA-256 cache key
+        """
+        inputs = {
+            'formular_id': formular_id,
+            'group_size': group_size,
+            'seed': seed,
+            'votes': fingerprint,
+            'algorithm': {name: getattr(algo_config, name) for name in ClusteringService.ALGORITHM_SETTINGS}
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def validate_inputs(group_size=None, seed=None):
+        """
+        Checks the group size and seed requested for a clustering.
+
+        Shared by the synchronous endpoint and the background jobs.
+
+        Args:
+            group_size: Requested group size, None for the formular's one
+            seed: Requested seed, None for CLUSTERING_SEED
+
+        Returns:
+            str: The error message, None if both are valid
+        """
+        if group_size is not None and (not isinstance(group_size, int) or isinstance(group_size, bool)
+                                       or group_size < 1):
+            return 'group_size must be a positive integer'
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+            return 'seed must be a non-negative integer'
+        return None
+
+    @staticmethod
+    def resolve_inputs(formular, group_size=None, seed=None):
+        """
+        Applies the defaults of a clustering request and computes its cache key.
+
+        Args:
+            formular (Formular): The formular to cluster
+            group_size (int): Requested group size, None for the formular's one
+            seed (int): Requested seed, None for CLUSTERING_SEED
+
+        Returns:
+            tuple: (group_size, seed, key) with the cache key of the clustering
+        """
+        if group_size is None:
+            group_size = formular.formular_nb_person_group
+        if seed is None:
+            seed = current_app.config['CLUSTERING_SEED']
+        key = ClusteringService.cache_key(
+            formular.formular_id, group_size, seed, VoteService.vote_fingerprint(formular.formular_id)
+        )
+        return group_size, seed, key
+
+    @staticmethod
+    def invalidate_cache(formular_id):
+        """
+        Removes the cached results of a formular.
+
+        Does not commit, so that it is part of the transaction changing the votes.
+
+        Args:
+            formular_id (int): The ID of the formular
+        """
+        ClusteringResult.query.filter_by(clustering_result_formid=formular_id).delete()
+
+    @staticmethod
+    def build_affinity_matrix(formular_id):
+        """
+        Builds the affinity matrix of a formular from its votes.
+
+        The votes are fetched as arrays by VoteService.get_form_vote_arrays and
+        the matrix is filled from them in one vectorized step. Votes cast by users
+        who are not students of the class (e.g. a teacher trying the form) are
+        ignored, so only students are placed in groups.
+
+        Args:
+            formular_id (int): The ID of the formular
+
+        Returns:
+            tuple: (names, student_ids, affinity_matrix)
+            - names is the list of student emails, indexing the matrix
+            - student_ids maps each email to its student ID (None if unknown)
+            - affinity_matrix is the final affinity matrix with mutual bonus
+        """
+        import numpy as np
+        from algo.data_processing import affinityFromVotes
+
+        votes = VoteService.get_form_vote_arrays(formular_id)
+        student_votes = np.array([voter is not None for voter in votes['voter_student_ids']], dtype=bool)
+        votes = {name: values[student_votes] for name, values in votes.items()}
+        count = len(votes['points'])
+        if count == 0:
+            return [], {}, np.zeros((0, 0))
+
+        # Index students by email: voters and chosen classmates share the same rows
+        emails = np.concatenate([votes['voter_emails'], votes['student_emails']]).astype(str)
+        names, inverse = np.unique(emails, return_inverse=True)
+        names = names.tolist()
+
+        student_ids = dict(zip(votes['voter_emails'].tolist(), votes['voter_student_ids'].tolist()))
+        student_ids.update(zip(votes['student_emails'].tolist(), votes['student_ids'].tolist()))
+
+        affinity = affinityFromVotes(
+            len(names), inverse[:count], inverse[count:], votes['points'], normalize=False
+        )
+        return names, student_ids, affinity
+
     @staticmethod
+    @ensure_app_context
     def get_clustering_for_formular(formular_id):
         """
         Generate student clusters based on votes for a specific formular.
-        
+
+        The cache key of the clustering is its ETag, so a client holding the
+        current groups gets a 304 without any clustering or serialization.
+
         Args:
             formular_id (int): The ID of the formular to generate groups for
-            
+
         Returns:
             dict: Groups of students and satisfaction metrics
         """
+        group_size = _int_arg('group_size')
+        seed = _int_arg('seed')
+        error = ClusteringService.validate_inputs(group_size, seed)
+        if error:
+            return {"status": "error", "message": error}, 400
+
+        formular = Formular.query.get(formular_id)
+        if not formular:
+            return {"status": "error", "message": "Formular not found"}, 404
+
+        _, _, key = ClusteringService.resolve_inputs(formular, group_size, seed)
+        return conditional_get(
+            key, lambda: ClusteringService.compute_clustering(formular_id, group_size, seed)
+        )
+
+    @staticmethod
+    @ensure_app_context
+    def compute_clustering(formular_id, group_size=None, seed=None, progress_callback=None):
+        """
+        Runs the clustering engine on the votes of a formular.
+
+        Independent from the HTTP request so that it can also run in a background job.
+
+        Args:
+            formular_id (int): The ID of the formular to generate groups for
+            group_size (int): Size of the groups, defaults to the formular's group size
+            seed (int): Seed of the clustering, defaults to CLUSTERING_SEED
+            progress_callback (callable): Receives the progress of each clustering attempt
+
+        Returns:
+            tuple: A tuple containing (response_data, status_code)
+            - response_data contains the groups and metrics or an error message
+            - status_code is the HTTP status code (200 for success)
+        """
         try:
-            # Récupérer les paramètres de la requête
-            group_size = request.args.get('group_size', default=GROUP_SIZE, type=int)
-            
-            # Récupérer les votes pour ce formulaire
-            # Cette partie dépend de votre structure de base de données
-            # votes = VoteService.get_votes_for_formular(formular_id)
-            
-            # Appeler l'algorithme de clustering (à implémenter)
-            # groups, metrics = perform_clustering(votes, group_size)
-            
-            # Pour le moment, retournons un résultat fictif
-            return {
+            formular = Formular.query.get(formular_id)
+            if not formular:
+                return {"status": "error", "message": "Formular not found"}, 404
+
+            group_size, seed, key = ClusteringService.resolve_inputs(formular, group_size, seed)
+            if not group_size or group_size < 1:
+                return {"status": "error", "message": "Group size must be a positive integer"}, 400
+
+            cached = ClusteringResult.query.filter_by(
+                clustering_result_formid=formular_id, clustering_result_key=key
+            ).first()
+            if cached:
+                return json.loads(cached.clustering_result_data), 200
+
+            from algo.metrics import timer
+            from algo.optimization import hybridBalancedClustering
+            from algo.scoring import calculateSatisfactionScore
+
+            # Phase durations go to the /metrics registry
+            recorder = MetricsService.clustering_recorder()
+
+            with timer("ingestion", recorder):
+                names, student_ids, affinity = ClusteringService.build_affinity_matrix(formular_id)
+            if not names:
+                return {"status": "error", "message": "No votes found for this formular"}, 404
+
+            groups = hybridBalancedClustering(names, affinity, group_size, seed=seed,
+                                              progressCallback=progress_callback, metrics=recorder)
+            with timer("scoring", recorder):
+                satisfaction, raw_score = calculateSatisfactionScore(groups, affinity, names)
+            sizes = [len(group) for group in groups]
+
+            result = {
                 "status": "success",
                 "message": "Clustering generated successfully",
                 "formular_id": formular_id,
                 "group_size": group_size,
                 "groups": [
-                    {"id": 1, "students": [{"id": 1, "name": "Student A"}, {"id": 2, "name": "Student B"}]},
-                    {"id": 2, "students": [{"id": 3, "name": "Student C"}, {"id": 4, "name": "Student D"}]}
+                    {
+                        "id": idx,
+                        "students": [
+                            {"id": student_ids.get(email), "name": email, "email": email}
+                            for email in group
+                        ]
+                    }
+                    for idx, group in enumerate(groups, 1)
                 ],
                 "metrics": {
-                    "satisfaction": 0.85,
-                    "equity": 0.95,
-                    "total_score": 90
+                    "satisfaction": float(satisfaction),
+                    "equity": 1.0 - (max(sizes) - min(sizes)) / max(sizes),
+                    "total_score": float(raw_score)
                 }
             }
-            
+
+            try:
+                db.session.add(ClusteringResult(
+                    clustering_result_formid=formular_id,
+                    clustering_result_key=key,
+                    clustering_result_data=json.dumps(result)
+                ))
+                db.session.commit()
+            except IntegrityError:
+                # Already stored by a concurrent request with the same inputs
+                db.session.rollback()
+
+            return result, 200
+
         except Exception as e:
             return {"status": "error", "message": str(e)}, 500
+
+def _int_arg(name):
+    """Returns a query parameter as an int, or as the raw string if it is not one."""
+    value = request.args.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return value
@@ -10,7 +10,7 @@ from flask import request, current_app
 from models.formular import Formular
 from extensions import db
 from datetime import datetime
-from services.utils import ensure_app_context
+from services.utils import ensure_app_context, paginate_query
 
 class FormularService:
     """
@@ -26,11 +26,13 @@ class FormularService:
         """
         Retrieves all formulars from the database.
         
+        Paginated with the 'limit' and 'after' parameters, or streamed
+        as NDJSON with 'format=ndjson' (see paginate_query).
+        
         Returns:
             list: A list of dictionaries containing formular information
         """
-        formulars = Formular.query.all()
-        return [formular.to_dict() for formular in formulars]
+        return paginate_query(Formular.query, Formular.formular_id)
     
     @staticmethod
     @ensure_app_context
@@ -44,8 +46,7 @@ class FormularService:
         Returns:
             list: A list of dictionaries containing the teacher's formulars
         """
-        formulars = Formular.query.filter_by(formular_creator=teacher_id).all()
-        return [formular.to_dict() for formular in formulars]
+        return paginate_query(Formular.query.filter_by(formular_creator=teacher_id), Formular.formular_id)
 
     @staticmethod
     def create_formular():
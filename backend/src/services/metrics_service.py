@@ -0,0 +1,191 @@
+"""
+Metrics Service Module.
+
+This module keeps in-process metrics of the API and renders them in the
+Prometheus text exposition format: request counts and latency histograms per
+route, SQL statement counts, password hashing times, and the duration of each
+clustering engine phase.
+No external service is needed, a Prometheus server can scrape /metrics directly.
+"""
+
+import threading
+import time
+from flask import current_app, g, request, has_request_context, Response
+from sqlalchemy import event
+from algo.metrics import MetricsRecorder
+from extensions import db
+
+# Histogram buckets, in seconds
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CLUSTERING_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+PASSWORD_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms.
+
+    Each metric is declared once with its type and help text, then updated for
+    any combination of label values.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def describe(self, name, kind, help_text, buckets=None):
+        """
+        Declares a metric.
+
+        Args:
+            name (str): Name of the metric
+            kind (str): 'counter' or 'histogram'
+            help_text (str): Description shown in the exposition
+            buckets (tuple): Upper bounds of the buckets of a histogram
+        """
+        self._metrics[name] = {'kind': kind, 'help': help_text, 'buckets': buckets, 'series': {}}
+
+    def inc(self, name, labels, amount=1):
+        """Adds amount to a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._metrics[name]['series']
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        """Records a value in a histogram."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics[name]
+            series = metric['series'].get(key)
+            if series is None:
+                series = metric['series'][key] = {'buckets': [0] * len(metric['buckets']), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(metric['buckets']):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['kind']}")
+                for key, value in sorted(metric['series'].items()):
+                    if metric['kind'] == 'counter':
+                        lines.append(f'{name}{_labels(key)} {value}')
+                        continue
+                    for bound, count in zip(metric['buckets'], value['buckets']):
+                        lines.append(f'{name}_bucket{_labels(key, le=bound)} {count}')
+                    lines.append(f"{name}_bucket{_labels(key, le='+Inf')} {value['count']}")
+                    lines.append(f"{name}_sum{_labels(key)} {value['sum']}")
+                    lines.append(f"{name}_count{_labels(key)} {value['count']}")
+        return '\n'.join(lines) + '\n'
+
+def _labels(key, le=None):
+    """Formats label pairs, with an optional histogram bound, as a Prometheus label set."""
+    pairs = list(key) + ([('le', le)] if le is not None else [])
+    if not pairs:
+        return ''
+    escaped = (
+        f'{label}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for label, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+class RegistryRecorder(MetricsRecorder):
+    """Clustering engine recorder feeding the phase durations to a metrics registry."""
+
+    def __init__(self, registry):
+        self.registry = registry
+
+    def observe(self, phase, seconds):
+        self.registry.observe('clustering_phase_seconds', {'phase': phase}, seconds)
+
+class MetricsService:
+    """
+    Service class exposing the metrics of the application.
+
+    Metrics are collected only when METRICS_ENABLED is set, in which case
+    init_metrics registers the request and database hooks.
+    """
+
+    @staticmethod
+    def registry():
+        """Returns the metrics registry of the current application, None if metrics are disabled."""
+        return current_app.extensions.get('metrics')
+
+    @staticmethod
+    def clustering_recorder():
+        """
+        Returns the recorder receiving the clustering engine phase durations.
+
+        Returns:
+            RegistryRecorder: The recorder, or None if metrics are disabled
+        """
+        registry = MetricsService.registry()
+        return RegistryRecorder(registry) if registry is not None else None
+
+    @staticmethod
+    def render_metrics():
+        """
+        Renders the metrics of the application for Prometheus.
+
+        Returns:
+            Response: The exposition text, or an error tuple if metrics are disabled
+        """
+        registry = MetricsService.registry()
+        if registry is None:
+            return {'error': 'Metrics are disabled'}, 404
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+def init_metrics(app):
+    """
+    Creates the metrics registry of an application and registers its hooks.
+
+    Args:
+        app (Flask): The application, with db already initialized
+    """
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    registry = MetricsRegistry()
+    registry.describe('http_requests_total', 'counter', 'Requests handled, by route, method and status.')
+    registry.describe('http_request_duration_seconds', 'histogram', 'Request latency, by route and method.',
+                      REQUEST_BUCKETS)
+    registry.describe('db_statements_total', 'counter', 'SQL statements executed, by route.')
+    registry.describe('clustering_phase_seconds', 'histogram', 'Duration of the clustering engine phases.',
+                      CLUSTERING_BUCKETS)
+    registry.describe('password_hash_seconds', 'histogram', 'Time spent hashing and verifying passwords.',
+                      PASSWORD_BUCKETS)
+    app.extensions['metrics'] = registry
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        route = request.url_rule.rule if has_request_context() and request.url_rule else 'background'
+        registry.inc('db_statements_total', {'route': route})
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        if 'metrics_start' not in g:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        registry.inc('http_requests_total', {
+            'route': route, 'method': request.method, 'status': str(response.status_code)
+        })
+        registry.observe('http_request_duration_seconds', {'route': route, 'method': request.method},
+                         time.perf_counter() - g.metrics_start)
+        return response
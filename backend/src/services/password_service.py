@@ -0,0 +1,120 @@
+"""
+Password Service Module.
+
+This module hashes and verifies passwords on a bounded pool of worker threads,
+so that a burst of logins cannot take every CPU away from the other requests.
+The hash method and cost come from the configuration, and the time spent
+hashing is recorded for monitoring and exported as the password_hash_seconds
+histogram of /metrics.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from services.metrics_service import MetricsService
+
+class PasswordService:
+    """
+    Service class for password hashing operations.
+
+    Each application gets its own pool of PASSWORD_HASH_WORKERS threads. Hashes
+    are created with PASSWORD_HASH_METHOD, which must be fully specified
+    (e.g. 'scrypt:32768:8:1') so that hashes made with other parameters can be
+    detected and upgraded on the next login.
+    """
+
+    @staticmethod
+    def _registry():
+        """Returns the worker pool and hashing statistics of the current application."""
+        app = current_app._get_current_object()
+        registry = app.extensions.get('password_hashing')
+        if registry is None:
+            registry = app.extensions.setdefault('password_hashing', {
+                'executor': ThreadPoolExecutor(
+                    max_workers=app.config['PASSWORD_HASH_WORKERS'],
+                    thread_name_prefix='password'
+                ),
+                'stats': {
+                    operation: {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+                    for operation in ('hash', 'verify')
+                },
+                'lock': threading.Lock()
+            })
+        return registry
+
+    @staticmethod
+    def _run(operation, func, *args):
+        """Runs a hashing function on the worker pool and records its duration."""
+        registry = PasswordService._registry()
+        metrics = MetricsService.registry()
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                with registry['lock']:
+                    stats = registry['stats'][operation]
+                    stats['count'] += 1
+                    stats['total_seconds'] += elapsed
+                    stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+                if metrics is not None:
+                    metrics.observe('password_hash_seconds', {'operation': operation}, elapsed)
+
+        return registry['executor'].submit(timed).result()
+
+    @staticmethod
+    def hash_password(password):
+        """
+        Hashes a password with the configured method.
+
+        Args:
+            password (str): The plain text password
+
+        Returns:
+            str: The password hash
+        """
+        method = current_app.config['PASSWORD_HASH_METHOD']
+        return PasswordService._run('hash', generate_password_hash, password, method)
+
+    @staticmethod
+    def verify_password(password_hash, password):
+        """
+        Checks a password against its hash.
+
+        Args:
+            password_hash (str): The stored password hash
+            password (str): The plain text password
+
+        Returns:
+            bool: True if the password matches the hash, False otherwise
+        """
+        return PasswordService._run('verify', check_password_hash, password_hash, password)
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        """
+        Tells whether a hash was made with other parameters than the configured ones.
+
+        Args:
+            password_hash (str): The stored password hash
+
+        Returns:
+            bool: True if the hash should be recomputed with the configured method
+        """
+        return password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
+
+    @staticmethod
+    def stats():
+        """
+        Returns the hashing statistics of the current application.
+
+        Returns:
+            dict: Count, total and maximum duration in seconds of each operation
+        """
+        registry = PasswordService._registry()
+        with registry['lock']:
+            return {operation: dict(stats) for operation, stats in registry['stats'].items()}
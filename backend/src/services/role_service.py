@@ -1,33 +1,51 @@
 from flask import request, current_app
 from models.role import Role
 from extensions import db
+from services.utils import ensure_app_context
 
 class RoleService:
     @staticmethod
-    def _ensure_app_context(func):
-        """Decorator to ensure database operations run in an app context"""
-        def wrapper(*args, **kwargs):
-            try:
-                # Check if we're already in an app context
-                current_app._get_current_object()
-                return func(*args, **kwargs)
-            except RuntimeError:
-                # If not, get the app and create a context
-                from app import get_app
-                app = get_app()
-                with app.app_context():
-                    return func(*args, **kwargs)
-        return wrapper
+    def role_names(refresh=False):
+        """Returns the role names by ID, loaded once per application since roles almost never change"""
+        names = current_app.extensions.get('role_names')
+        if names is None or refresh:
+            names = dict(db.session.query(Role.role_id, Role.role_name).all())
+            current_app.extensions['role_names'] = names
+        return names
     
     @staticmethod
-    @_ensure_app_context
+    def role_name(role_id):
+        """Resolves a role ID to its name from the cache, reloading it once for unknown IDs"""
+        if role_id is None:
+            return None
+        names = RoleService.role_names()
+        if role_id not in names:
+            names = RoleService.role_names(refresh=True)
+        return names.get(role_id)
+    
+    @staticmethod
+    def role_id(role_name):
+        """Resolves a role name to its ID from the cache, reloading it once for unknown names"""
+        for refresh in (False, True):
+            for role_id, name in RoleService.role_names(refresh).items():
+                if name == role_name:
+                    return role_id
+        return None
+    
+    @staticmethod
+    def invalidate_cache():
+        """Drops the cached role names, to be called whenever roles change"""
+        current_app.extensions.pop('role_names', None)
+    
+    @staticmethod
+    @ensure_app_context
     def get_all_roles():
         """Retrieves all roles"""
         roles = Role.query.all()
         return [role.to_dict() for role in roles]
     
     @staticmethod
-    @_ensure_app_context
+    @ensure_app_context
     def get_role(role_id):
         """Retrieves a role by ID"""
         role = Role.query.get(role_id)
@@ -55,6 +73,7 @@ class RoleService:
             new_role = Role(role_name=role_name)
             db.session.add(new_role)
             db.session.commit()
+            RoleService.invalidate_cache()
             return new_role.to_dict(), 201
         except Exception as e:
             db.session.rollback()
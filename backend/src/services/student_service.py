@@ -9,7 +9,8 @@ from flask import request, current_app
 from models.student import Student
 from extensions import db
 import re
-from services.utils import ensure_app_context
+from sqlalchemy import select, insert
+from services.utils import ensure_app_context, chunked, paginate_query
 
 class StudentService:
     """
@@ -39,11 +40,13 @@ class StudentService:
         """
         Retrieves all students from the database.
         
+        Paginated with the 'limit' and 'after' parameters, or streamed
+        as NDJSON with 'format=ndjson' (see paginate_query).
+        
         Returns:
             list: A list of dictionaries containing student information
         """
-        students = Student.query.all()
-        return [student.to_dict() for student in students]
+        return paginate_query(Student.query, Student.student_id)
     
     @staticmethod
     @ensure_app_context
@@ -109,6 +112,8 @@ class StudentService:
         Creates multiple students in a single request.
         
         Expects a JSON array of objects, each with an 'email' field.
+        Existing emails are looked up with chunked IN queries and the new
+        students are inserted at once, instead of one query per item.
         
         Returns:
             tuple: A tuple containing (response_data, status_code)
@@ -128,6 +133,8 @@ class StudentService:
             'failed': []
         }
         
+        candidates = []
+        seen = set()
         for item in data:
             if not isinstance(item, dict) or 'email' not in item:
                 results['failed'].append({'data': item, 'reason': 'Missing email field'})
@@ -140,30 +147,46 @@ class StudentService:
                 results['failed'].append({'data': item, 'reason': 'Invalid email format'})
                 continue
             
-            # Check if the email already exists
-            existing_student = Student.query.filter_by(student_email=email).first()
-            if existing_student:
-                results['failed'].append({'data': item, 'reason': 'Email already exists'})
+            # Keep the first occurrence of an email repeated in the request
+            if email in seen:
+                results['failed'].append({'data': item, 'reason': 'Duplicate email in request'})
                 continue
-            
-            # Create a new student
-            try:
-                new_student = Student(student_email=email)
-                db.session.add(new_student)
-                db.session.flush()  #To obtain the ID without committing
-                results['success'].append(new_student.to_dict())
-            except Exception as e:
-                results['failed'].append({'data': item, 'reason': f'Database error: {str(e)}'})
-        
-        # Commit ou rollback selon les résultats
-        if results['success']:
-            try:
-                db.session.commit()
-            except Exception as e:
-                db.session.rollback()
-                return {'error': f'Failed to commit changes: {str(e)}'}, 500
-        else:
+            seen.add(email)
+            candidates.append(item)
+        
+        chunk_size = current_app.config['BATCH_CHUNK_SIZE']
+        
+        # Check which emails already exist
+        existing = set()
+        emails = [item['email'] for item in candidates]
+        for chunk in chunked(emails, chunk_size):
+            existing.update(db.session.execute(
+                select(Student.student_email).where(Student.student_email.in_(chunk))
+            ).scalars())
+        
+        new_emails = []
+        for item in candidates:
+            if item['email'] in existing:
+                results['failed'].append({'data': item, 'reason': 'Email already exists'})
+            else:
+                new_emails.append(item['email'])
+        
+        if not new_emails:
+            return results, 207 if results['failed'] else 201
+        
+        # Insert all the new students with a single executemany
+        try:
+            db.session.execute(insert(Student), [{'student_email': email} for email in new_emails])
+            # Select the new rows back to report their IDs
+            created = {}
+            for chunk in chunked(new_emails, chunk_size):
+                for student in Student.query.filter(Student.student_email.in_(chunk)):
+                    created[student.student_email] = student.to_dict()
+            results['success'] = [created[email] for email in new_emails]
+            db.session.commit()
+        except Exception as e:
             db.session.rollback()
+            return {'error': f'Failed to commit changes: {str(e)}'}, 500
         
         return results, 207 if results['failed'] else 201
     
@@ -9,7 +9,8 @@ from flask import request, current_app
 from models.teacher import Teacher
 from extensions import db
 import re
-from services.utils import ensure_app_context
+from sqlalchemy import select, insert
+from services.utils import ensure_app_context, chunked, paginate_query
 
 class TeacherService:
     """
@@ -39,11 +40,13 @@ class TeacherService:
         """
         Retrieves all teachers from the database.
         
+        Paginated with the 'limit' and 'after' parameters, or streamed
+        as NDJSON with 'format=ndjson' (see paginate_query).
+        
         Returns:
             list: A list of dictionaries containing teacher information
         """
-        teachers = Teacher.query.all()
-        return [teacher.to_dict() for teacher in teachers]
+        return paginate_query(Teacher.query, Teacher.teacher_email)
     
     @staticmethod
     @ensure_app_context
@@ -109,6 +112,8 @@ class TeacherService:
         Creates multiple teachers in a single request.
         
         Expects a JSON array of objects, each with an 'email' field.
+        Existing emails are looked up with chunked IN queries and the new
+        teachers are inserted at once, instead of one query per item.
         
         Returns:
             tuple: A tuple containing (response_data, status_code)
@@ -128,6 +133,8 @@ class TeacherService:
             'failed': []
         }
         
+        candidates = []
+        seen = set()
         for item in data:
             if not isinstance(item, dict) or 'email' not in item:
                 results['failed'].append({'data': item, 'reason': 'Missing email field'})
@@ -140,29 +147,41 @@ class TeacherService:
                 results['failed'].append({'data': item, 'reason': 'Invalid email format'})
                 continue
             
-            # Check if email already exists
-            existing_teacher = Teacher.query.get(email)
-            if existing_teacher:
-                results['failed'].append({'data': item, 'reason': 'Email already exists'})
+            # Keep the first occurrence of an email repeated in the request
+            if email in seen:
+                results['failed'].append({'data': item, 'reason': 'Duplicate email in request'})
                 continue
-            
-            # Create new teacher
-            try:
-                new_teacher = Teacher(teacher_email=email)
-                db.session.add(new_teacher)
-                results['success'].append(new_teacher.to_dict())
-            except Exception as e:
-                results['failed'].append({'data': item, 'reason': f'Database error: {str(e)}'})
+            seen.add(email)
+            candidates.append(item)
         
-        # Commit or rollback based on results
-        if results['success']:
-            try:
-                db.session.commit()
-            except Exception as e:
-                db.session.rollback()
-                return {'error': f'Failed to commit changes: {str(e)}'}, 500
-        else:
+        chunk_size = current_app.config['BATCH_CHUNK_SIZE']
+        
+        # Check which emails already exist
+        existing = set()
+        emails = [item['email'] for item in candidates]
+        for chunk in chunked(emails, chunk_size):
+            existing.update(db.session.execute(
+                select(Teacher.teacher_email).where(Teacher.teacher_email.in_(chunk))
+            ).scalars())
+        
+        new_emails = []
+        for item in candidates:
+            if item['email'] in existing:
+                results['failed'].append({'data': item, 'reason': 'Email already exists'})
+            else:
+                new_emails.append(item['email'])
+        
+        if not new_emails:
+            return results, 207 if results['failed'] else 201
+        
+        # Insert all the new teachers with a single executemany
+        try:
+            db.session.execute(insert(Teacher), [{'teacher_email': email} for email in new_emails])
+            results['success'] = [{'teacher_email': email} for email in new_emails]
+            db.session.commit()
+        except Exception as e:
             db.session.rollback()
+            return {'error': f'Failed to commit changes: {str(e)}'}, 500
         
         return results, 207 if results['failed'] else 201
     
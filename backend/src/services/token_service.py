@@ -0,0 +1,147 @@
+"""
+Token Service Module.
+
+This module verifies the JWT tokens issued by AuthService.login. Decoded claims
+are kept in a small per-application TTL/LRU cache keyed by token, so protected
+endpoints authenticate a request without decoding it again nor querying the
+database, and expose the user to services through flask.g.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+import jwt
+from flask import request, current_app, g
+
+class TokenService:
+    """
+    Service class for verifying JWT tokens.
+
+    Claims stay cached for TOKEN_CACHE_TTL seconds at most, never past the
+    expiration of their token, and only the TOKEN_CACHE_SIZE most recently used
+    tokens are kept.
+    """
+
+    ALGORITHM = 'HS256'
+
+    @staticmethod
+    def _cache():
+        """Returns the decoded claims cache of the current application."""
+        app = current_app._get_current_object()
+        cache = app.extensions.get('token_cache')
+        if cache is None:
+            cache = app.extensions.setdefault('token_cache', {
+                'claims': OrderedDict(),
+                'lock': threading.Lock()
+            })
+        return cache
+
+    @staticmethod
+    def decode(token):
+        """
+        Verifies a token and returns its claims, from the cache when possible.
+
+        Args:
+            token (str): The encoded JWT token
+
+        Returns:
+            dict: The claims of the token
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired
+        """
+        cache = TokenService._cache()
+        now = time.time()
+
+        with cache['lock']:
+            entry = cache['claims'].get(token)
+            if entry is not None:
+                claims, valid_until = entry
+                if now < valid_until:
+                    cache['claims'].move_to_end(token)
+                    return claims
+                del cache['claims'][token]
+
+        claims = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=[TokenService.ALGORITHM])
+        valid_until = min(now + current_app.config['TOKEN_CACHE_TTL'], claims.get('exp', now))
+
+        with cache['lock']:
+            cache['claims'][token] = (claims, valid_until)
+            cache['claims'].move_to_end(token)
+            while len(cache['claims']) > current_app.config['TOKEN_CACHE_SIZE']:
+                cache['claims'].popitem(last=False)
+        return claims
+
+    @staticmethod
+    def bearer_token(allow_query_token=False):
+        """
+        Extracts the bearer token of the current request.
+
+        Args:
+            allow_query_token (bool): Fall back to the 'access_token' query parameter,
+                for clients that cannot set headers such as EventSource. Only meant
+                for streams, since tokens in URLs end up in logs and Referer headers
+
+        Returns:
+            str: The token, or None if the request carries none
+        """
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and token.strip():
+            return token.strip()
+        if allow_query_token:
+            return request.args.get('access_token') or None
+        return None
+
+def _authenticate(func, allow_query_token):
+    """Wraps a resource method so that it authenticates the request first."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = TokenService.bearer_token(allow_query_token)
+        if token is None:
+            if current_app.config['AUTH_REQUIRED']:
+                return {'error': 'Authentication required'}, 401
+            return func(*args, **kwargs)
+
+        try:
+            claims = TokenService.decode(token)
+        except jwt.ExpiredSignatureError:
+            return {'error': 'Token has expired'}, 401
+        except jwt.InvalidTokenError:
+            return {'error': 'Invalid token'}, 401
+
+        g.user_id = claims.get('user_id')
+        g.user_email = claims.get('email')
+        g.user_role = claims.get('role')
+        return func(*args, **kwargs)
+    return wrapper
+
+def auth_required(func):
+    """
+    Decorator authenticating the request with its bearer token.
+
+    A valid token exposes its user through g.user_id, g.user_email and g.user_role.
+    An invalid or expired token is always rejected with a 401, while a missing
+    token is only rejected when AUTH_REQUIRED is set.
+
+    Args:
+        func (callable): The resource method to protect
+
+    Returns:
+        callable: The wrapped method
+    """
+    return _authenticate(func, allow_query_token=False)
+
+def stream_auth_required(func):
+    """
+    Decorator like auth_required that also accepts the 'access_token' query parameter.
+
+    Only for server-sent event streams, which EventSource opens without headers.
+
+    Args:
+        func (callable): The resource method to protect
+
+    Returns:
+        callable: The wrapped method
+    """
+    return _authenticate(func, allow_query_token=True)
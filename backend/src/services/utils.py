@@ -5,7 +5,13 @@ This module provides common utilities that are used throughout the application's
 including decorators for handling application context and other shared helper functions.
 """
 
-from flask import current_app
+import hashlib
+import json
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, request, has_app_context, has_request_context, Response, stream_with_context
+from werkzeug.http import quote_etag
+from extensions import db
 
 def ensure_app_context(func):
     """
@@ -13,6 +19,9 @@ def ensure_app_context(func):
     
     This prevents the common issue of attempting database operations
     outside of a Flask application context by creating one if needed.
+    Inside a context the function is called directly; loops calling services
+    outside of a request should use service_scope so that a single context is
+    pushed for all of their calls instead of one per call.
     
     Args:
         func (callable): The function to wrap with app context handling
@@ -26,15 +35,163 @@ def ensure_app_context(func):
             # Database operations here
             pass
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            # Check if we're already in an app context
-            current_app._get_current_object()
+        if has_app_context():
+            return func(*args, **kwargs)
+        # If not, get the app and create a context
+        from app import get_app
+        with get_app().app_context():
             return func(*args, **kwargs)
-        except RuntimeError:
-            # If not, get the app and create a context
-            from app import get_app
-            app = get_app()
-            with app.app_context():
-                return func(*args, **kwargs)
     return wrapper
+
+@contextmanager
+def service_scope(app=None):
+    """
+    Context manager running many service calls in one app context and one session.
+    
+    Batch scripts and background work calling services in a loop push a single
+    app context, so the database session is created once and torn down once
+    when the scope ends. The session is rolled back if the block raises.
+    Within an existing app context, the current context and session are reused.
+    
+    Args:
+        app (Flask): The application, defaults to the one returned by get_app
+        
+    Yields:
+        Session: The database session shared by the service calls
+        
+    Example:
+        with service_scope():
+            for student_id in student_ids:
+                StudentService.get_student(student_id)
+    """
+    if has_app_context():
+        yield db.session
+        return
+    
+    if app is None:
+        from app import get_app
+        app = get_app()
+    
+    with app.app_context():
+        try:
+            yield db.session
+        except Exception:
+            db.session.rollback()
+            raise
+
+def chunked(values, size):
+    """
+    Splits a list into consecutive chunks of at most size items.
+    
+    Used to keep the number of bound parameters of IN queries below the
+    database limits (999 on older SQLite builds).
+    
+    Args:
+        values (list): The values to split
+        size (int): Maximum number of values per chunk
+        
+    Returns:
+        generator: Yields lists of values
+    """
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def paginate_query(query, key_column):
+    """
+    Serializes the rows of a list query, paginated or streamed on request.
+    
+    Without query parameters every row is returned, as the list endpoints always did.
+    The request can instead ask for:
+    
+    - keyset pagination with 'limit' and 'after': rows with a key greater than
+      'after' are returned in key order, at most 'limit' of them (ITEMS_PER_PAGE
+      when only 'after' is given, capped to MAX_ITEMS_PER_PAGE). The cursor of the
+      next page is sent in the X-Next-Cursor header while more rows remain.
+    - an NDJSON export with 'format=ndjson': rows are streamed one JSON object per
+      line from a server-side cursor, STREAM_BATCH_SIZE rows at a time.
+    
+    Args:
+        query (Query): The query selecting the rows to list
+        key_column (InstrumentedAttribute): Unique column ordering the rows, used as cursor
+        
+    Returns:
+        list, tuple or Response: The rows, the page with its headers, or the NDJSON stream
+    """
+    if not has_request_context():
+        return [row.to_dict() for row in query.all()]
+    
+    config = current_app.config
+    
+    if request.args.get('format') == 'ndjson':
+        rows = query.order_by(key_column).yield_per(config['STREAM_BATCH_SIZE'])
+        
+        def generate():
+            for row in rows:
+                yield json.dumps(row.to_dict()) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    limit = request.args.get('limit', type=int)
+    after = request.args.get('after', type=key_column.type.python_type)
+    if limit is None and after is None:
+        return [row.to_dict() for row in query.all()]
+    
+    limit = min(max(limit or config['ITEMS_PER_PAGE'], 1), config['MAX_ITEMS_PER_PAGE'])
+    if after is not None:
+        query = query.filter(key_column > after)
+    
+    # Fetch one extra row to know whether another page follows
+    rows = query.order_by(key_column).limit(limit + 1).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers['X-Next-Cursor'] = str(getattr(rows[-1], key_column.key))
+    return [row.to_dict() for row in rows], 200, headers
+
+
+def content_etag(data):
+    """
+    Computes a version tag from the content of a JSON-serializable resource.
+    
+    Args:
+        data: The resource data
+        
+    Returns:
+        str: Hexadecimal SHA-1 digest of the canonical JSON of the data
+    """
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+def conditional_get(etag, build):
+    """
+    Answers a GET request conditionally on the version tag of its resource.
+    
+    When the If-None-Match header of the request lists the tag, an empty 304 is
+    returned without building the response. Otherwise the response is built and
+    successful ones are sent with the tag in their ETag header.
+    
+    Args:
+        etag (str): Version tag of the requested resource
+        build (callable): Builds the response, returning data, a tuple or a Response
+        
+    Returns:
+        tuple or Response: The response, tagged when successful
+    """
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    result = build()
+    if isinstance(result, Response):
+        result.set_etag(etag)
+        return result
+    
+    if not isinstance(result, tuple):
+        result = (result, 200)
+    data, status, headers = (result + ({},))[:3]
+    if status == 200:
+        headers = dict(headers, ETag=quote_etag(etag))
+    return data, status, headers
@@ -6,10 +6,15 @@ including CRUD operations and retrieving votes by user or form.
 A vote represents a student's preference for other students in a form.
 """
 
-from flask import request, current_app
+from flask import request, current_app, g
+from sqlalchemy import select, insert, delete, func, cast, Float
+from sqlalchemy.exc import IntegrityError
 from models.vote import Vote
+from models.auth_user import AuthUser
+from models.student import Student
 from extensions import db
-from services.utils import ensure_app_context
+from services.utils import ensure_app_context, paginate_query
+from algo.config import TOTAL_POINTS
 
 class VoteService:
     """
@@ -18,19 +23,26 @@ class VoteService:
     This class provides methods for vote management including creating,
     retrieving, and deleting vote records, as well as retrieving votes
     by user or form.
+    
+    When a token authenticated the request, its user is the voter, and only
+    MODERATOR_ROLES may delete the votes of other users.
     """
     
+    MODERATOR_ROLES = ('admin', 'teacher')
+    
     @staticmethod
     @ensure_app_context
     def get_all_votes():
         """
         Retrieves all votes from the database.
         
+        Paginated with the 'limit' and 'after' parameters, or streamed
+        as NDJSON with 'format=ndjson' (see paginate_query).
+        
         Returns:
             list: A list of dictionaries containing vote information
         """
-        votes = Vote.query.all()
-        return [vote.to_dict() for vote in votes]
+        return paginate_query(Vote.query, Vote.vote_idvote)
     
     @staticmethod
     @ensure_app_context
@@ -44,8 +56,7 @@ class VoteService:
         Returns:
             list: A list of dictionaries containing the user's votes
         """
-        votes = Vote.query.filter_by(vote_userid=user_id).all()
-        return [vote.to_dict() for vote in votes]
+        return paginate_query(Vote.query.filter_by(vote_userid=user_id), Vote.vote_idvote)
     
     @staticmethod
     @ensure_app_context
@@ -59,8 +70,120 @@ class VoteService:
         Returns:
             list: A list of dictionaries containing votes for the form
         """
-        votes = Vote.query.filter_by(vote_formid=form_id).all()
-        return [vote.to_dict() for vote in votes]
+        return paginate_query(Vote.query.filter_by(vote_formid=form_id), Vote.vote_idvote)
+    
+    @staticmethod
+    @ensure_app_context
+    def vote_fingerprint(form_id):
+        """
+        Computes a cheap fingerprint of the votes of a form with one aggregate query.
+        
+        Any vote added, removed or changed alters the count, the highest ID or the sums,
+        so the fingerprint serves as version tag of the form's votes.
+        
+        Args:
+            form_id (int): The ID of the form
+            
+        Returns:
+            str: Fingerprint of the form's votes
+        """
+        count, max_id, total_weight, weighted_ids = db.session.query(
+            func.count(Vote.vote_idvote),
+            func.max(Vote.vote_idvote),
+            func.sum(Vote.weigth),
+            func.sum(Vote.vote_idvote * Vote.weigth)
+        ).filter(Vote.vote_formid == form_id).one()
+        return f'{count}:{max_id}:{total_weight}:{weighted_ids}'
+    
+    @staticmethod
+    @ensure_app_context
+    def get_form_vote_arrays(form_id):
+        """
+        Fetches the votes of a form as NumPy arrays, ready to build an affinity matrix.
+        
+        A single core SQL query sums the points of each (voter, chosen student) pair,
+        joins the per-voter totals computed by GROUP BY to normalize them to
+        TOTAL_POINTS, and matches each voting user to its student by email.
+        No ORM object is created.
+        
+        Args:
+            form_id (int): The ID of the form
+            
+        Returns:
+            dict: Arrays with one entry per (voter, chosen student) pair:
+            - voter_emails and voter_student_ids (None if the voter is not a student)
+            - student_emails and student_ids of the chosen classmates
+            - points normalized so that each voter distributes TOTAL_POINTS
+        """
+        vote = Vote.__table__
+        auth_user = AuthUser.__table__
+        student = Student.__table__
+        voter_student = student.alias('voter_student')
+        
+        totals = select(
+            vote.c.vote_userid.label('voter_id'),
+            func.sum(vote.c.weigth).label('total')
+        ).where(
+            vote.c.vote_formid == form_id
+        ).group_by(vote.c.vote_userid).subquery('voter_totals')
+        
+        statement = select(
+            auth_user.c.auth_user_email,
+            voter_student.c.student_id,
+            student.c.student_email,
+            student.c.student_id,
+            cast(func.sum(vote.c.weigth), Float) * TOTAL_POINTS / totals.c.total
+        ).select_from(
+            vote.join(auth_user, auth_user.c.auth_user_id == vote.c.vote_userid)
+                .join(student, student.c.student_id == vote.c.vote_studentid)
+                .join(totals, totals.c.voter_id == vote.c.vote_userid)
+                .outerjoin(voter_student, voter_student.c.student_email == auth_user.c.auth_user_email)
+        ).where(
+            vote.c.vote_formid == form_id,
+            totals.c.total > 0
+        ).group_by(
+            auth_user.c.auth_user_email, voter_student.c.student_id,
+            student.c.student_email, student.c.student_id, totals.c.total
+        )
+        
+        import numpy as np  # Only needed by the clustering, kept out of API startup
+        
+        rows = db.session.execute(statement).all()
+        columns = list(zip(*rows)) if rows else [()] * 5
+        return {
+            'voter_emails': np.array(columns[0], dtype=object),
+            'voter_student_ids': np.array(columns[1], dtype=object),
+            'student_emails': np.array(columns[2], dtype=object),
+            'student_ids': np.array(columns[3], dtype=object),
+            'points': np.array(columns[4], dtype=float)
+        }
+    
+    @staticmethod
+    def _invalidate_clustering_cache(form_id):
+        """Drops the cached clusterings of a form, imported here to avoid a circular import."""
+        from services.clustering_service import ClusteringService
+        ClusteringService.invalidate_cache(form_id)
+        
+    @staticmethod
+    def _bind_voter(data):
+        """
+        Makes the authenticated user, if any, the voter of a request.
+        
+        The body's 'userid' may then be omitted, and must match the user when given.
+        
+        Args:
+            data (dict): The request body, whose 'userid' is set to the user
+            
+        Returns:
+            tuple: An error (response_data, status_code), None if the request may proceed
+        """
+        user_id = g.get('user_id')
+        if user_id is None:
+            return None
+        if 'userid' in data and data['userid'] != user_id:
+            return {'error': 'Cannot vote on behalf of another user'}, 403
+        data['userid'] = user_id
+        return None
         
     @staticmethod
     def create_vote():
@@ -68,7 +191,7 @@ class VoteService:
         Creates a new vote based on the request data.
         
         Expects a JSON body with 'userid', 'idform', 'idstudent',
-        and 'weight' fields.
+        and 'weight' fields. 'userid' defaults to the authenticated user.
         
         Returns:
             tuple: A tuple containing (response_data, status_code)
@@ -82,6 +205,10 @@ class VoteService:
         
         if not data:
             return {'error': 'No data provided'}, 400
+        
+        error = VoteService._bind_voter(data)
+        if error:
+            return error
             
         required_fields = ['userid', 'idform', 'idstudent', 'weight']
         for field in required_fields:
@@ -97,13 +224,94 @@ class VoteService:
             )
             
             db.session.add(new_vote)
+            VoteService._invalidate_clustering_cache(new_vote.vote_formid)
             db.session.commit()
             return new_vote.to_dict(), 201
             
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': 'This user already voted for this student in this form'}, 409
         except Exception as e:
             db.session.rollback()
             return {'error': f'Failed to create vote: {str(e)}'}, 500
     
+    @staticmethod
+    def create_votes_batch():
+        """
+        Saves a user's whole ballot for a form in a single transaction.
+        
+        Expects a JSON body with 'userid', 'idform' and a 'votes' list of objects
+        with 'idstudent' and 'weight' fields, whose weights sum to TOTAL_POINTS.
+        'userid' defaults to the authenticated user. Any previous ballot of the
+        user for the form is replaced atomically and all votes are inserted with
+        one executemany.
+        
+        Returns:
+            tuple: A tuple containing (response_data, status_code)
+            - response_data is either the saved ballot or an error message
+            - status_code is the HTTP status code (201 for success)
+            
+        Raises:
+            Exception: If database operations fail
+        """
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'No data provided'}, 400
+        
+        error = VoteService._bind_voter(data)
+        if error:
+            return error
+            
+        required_fields = ['userid', 'idform', 'votes']
+        for field in required_fields:
+            if field not in data:
+                return {'error': f'Missing required field: {field}'}, 400
+        
+        votes = data['votes']
+        if not isinstance(votes, list) or not votes:
+            return {'error': 'Expected a non-empty list of votes'}, 400
+        
+        for item in votes:
+            if not isinstance(item, dict) or 'idstudent' not in item or 'weight' not in item:
+                return {'error': 'Each vote requires idstudent and weight fields'}, 400
+            if not isinstance(item['weight'], int) or item['weight'] <= 0:
+                return {'error': 'Weights must be positive integers'}, 400
+        
+        if len({item['idstudent'] for item in votes}) != len(votes):
+            return {'error': 'A student can only appear once in a ballot'}, 400
+        
+        total = sum(item['weight'] for item in votes)
+        if total != TOTAL_POINTS:
+            return {'error': f'Weights must sum to {TOTAL_POINTS}, got {total}'}, 400
+        
+        rows = [{
+            'vote_userid': data['userid'],
+            'vote_formid': data['idform'],
+            'vote_studentid': item['idstudent'],
+            'weigth': item['weight']
+        } for item in votes]
+        
+        try:
+            vote = Vote.__table__
+            db.session.execute(delete(vote).where(
+                vote.c.vote_userid == data['userid'],
+                vote.c.vote_formid == data['idform']
+            ))
+            db.session.execute(insert(vote), rows)
+            VoteService._invalidate_clustering_cache(data['idform'])
+            db.session.commit()
+            return {
+                'message': 'Ballot saved successfully',
+                'userid': data['userid'],
+                'idform': data['idform'],
+                'votes': [{'idstudent': item['idstudent'], 'weight': item['weight']} for item in votes]
+            }, 201
+            
+        except Exception as e:
+            db.session.rollback()
+            return {'error': f'Failed to save ballot: {str(e)}'}, 500
+    
     @staticmethod
     @ensure_app_context
     def get_vote(vote_id):
@@ -133,7 +341,7 @@ class VoteService:
         Returns:
             tuple: A tuple containing (response_data, status_code)
             - response_data is a success or error message
-            - status_code is the HTTP status code (204 for success, 404 if not found)
+            - status_code is the HTTP status code (204 for success, 403 for a vote of another user, 404 if not found)
             
         Raises:
             Exception: If database operations fail
@@ -142,8 +350,14 @@ class VoteService:
         if not vote:
             return {'error': 'Vote not found'}, 404
         
+        user_id = g.get('user_id')
+        if (user_id is not None and vote.vote_userid != user_id
+                and g.get('user_role') not in VoteService.MODERATOR_ROLES):
+            return {'error': 'Cannot delete the vote of another user'}, 403
+        
         try:
             db.session.delete(vote)
+            VoteService._invalidate_clustering_cache(vote.vote_formid)
             db.session.commit()
             return {'message': 'Vote deleted successfully'}, 204
         except Exception as e:
@@ -1,6 +1,7 @@
 import os
 import pytest
 import tempfile
+from datetime import datetime
 from app import create_app
 from extensions import db
 from models.role import Role
@@ -8,6 +9,8 @@ from models.auth_user import AuthUser
 from models.student import Student
 from models.teacher import Teacher
 from models.user_role import UserRole
+from models.formular import Formular
+from models.vote import Vote
 from werkzeug.security import generate_password_hash
 
 @pytest.fixture
@@ -16,10 +19,11 @@ def app():
     # Create a temporary file to isolate the database for each test
     db_fd, db_path = tempfile.mkstemp()
     
-    app = create_app('testing')
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
-    app.config['TESTING'] = True
-    app.config['SECRET_KEY'] = 'test-secret-key'
+    app = create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'TESTING': True,
+        'SECRET_KEY': 'test-secret-key'
+    })
     
     # Create the database and the tables
     with app.app_context():
@@ -38,6 +42,9 @@ def app():
     # Close and remove the temporary database
     os.close(db_fd)
     os.unlink(db_path)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
 
 @pytest.fixture
 def client(app):
@@ -90,3 +97,38 @@ def init_database(app):
         db.session.commit()
     
     yield
+
+@pytest.fixture
+def voted_formular(app):
+    """Create a formular where students vote for their preferred classmates."""
+    emails = [f'student{i}@test.com' for i in range(6)]
+    with app.app_context():
+        students = [Student(student_email=email) for email in emails]
+        users = [
+            AuthUser(auth_user_email=email, auth_user_mdp='x', auth_user_name='Test', auth_user_firstname=str(i))
+            for i, email in enumerate(emails)
+        ]
+        db.session.add_all(students + users)
+        db.session.flush()
+        
+        formular = Formular(
+            formular_title='Groups',
+            formular_description='Project groups',
+            formular_creator=users[0].auth_user_id,
+            formular_start=datetime(2025, 1, 1),
+            formular_end=datetime(2025, 2, 1),
+            formular_nb_person_group=2
+        )
+        db.session.add(formular)
+        db.session.flush()
+        
+        # Mutual pairs: 0-1, 2-3, 4-5
+        for voter, chosen in [(0, 1), (1, 0), (2, 3), (3, 2), (4, 5), (5, 4)]:
+            db.session.add(Vote(
+                vote_userid=users[voter].auth_user_id,
+                vote_formid=formular.formular_id,
+                vote_studentid=students[chosen].student_id,
+                weigth=100
+            ))
+        db.session.commit()
+        return formular.formular_id
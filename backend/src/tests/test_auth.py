@@ -98,3 +98,99 @@ def test_login_invalid_credentials(client, init_database):
     data = json.loads(response.data)
     assert 'error' in data
     assert 'Invalid email or password' in data['error']
+
+def test_login_single_query(app, client, init_database):
+    """Test that a login with the role names cached runs a single query."""
+    from sqlalchemy import event
+    from extensions import db
+    
+    credentials = {'email': 'student@test.com', 'password': 'Password123'}
+    client.post('/auth/login', json=credentials)
+    
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        response = client.post('/auth/login', json=credentials)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    
+    assert response.status_code == 200
+    assert json.loads(response.data)['user']['role'] == 'student'
+    assert len(statements) == 1
+
+def test_login_rehashes_outdated_password(app, client, init_database):
+    """Test that a hash made with other parameters is upgraded on login."""
+    from models.auth_user import AuthUser
+    from services.password_service import PasswordService
+    
+    response = client.post('/auth/login', json={'email': 'student@test.com', 'password': 'Password123'})
+    assert response.status_code == 200
+    
+    with app.app_context():
+        user = AuthUser.query.filter_by(auth_user_email='student@test.com').first()
+        assert user.auth_user_mdp.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+        assert not PasswordService.needs_rehash(user.auth_user_mdp)
+        stats = PasswordService.stats()
+        assert stats['verify']['count'] == 1
+        assert stats['hash']['count'] == 1
+        assert stats['hash']['max_seconds'] > 0
+    
+    response = client.post('/auth/login', json={'email': 'student@test.com', 'password': 'Password123'})
+    assert response.status_code == 200
+    
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'password_hash_seconds_count{operation="hash"} 1' in body
+    assert 'password_hash_seconds_count{operation="verify"} 2' in body
+
+def login_token(client):
+    """Logs the test student in and returns its token."""
+    response = client.post('/auth/login', json={'email': 'student@test.com', 'password': 'Password123'})
+    return json.loads(response.data)['token']
+
+def test_protected_endpoint_requires_token(app, client, init_database):
+    """Test that protected endpoints reject missing tokens when authentication is required."""
+    app.config['AUTH_REQUIRED'] = True
+    
+    response = client.get('/votes')
+    assert response.status_code == 401
+    
+    token = login_token(client)
+    response = client.get('/votes', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+
+def test_query_token_only_accepted_on_event_streams(app, client, init_database):
+    """Test that the access_token query parameter is ignored outside event streams."""
+    app.config['AUTH_REQUIRED'] = True
+    token = login_token(client)
+    
+    assert client.get(f'/votes?access_token={token}').status_code == 401
+    assert client.get(f'/clustering/jobs/unknown/events?access_token={token}').status_code == 404
+
+def test_protected_endpoint_rejects_invalid_token(client):
+    """Test that an invalid token is rejected even when authentication is optional."""
+    response = client.get('/votes', headers={'Authorization': 'Bearer not-a-token'})
+    assert response.status_code == 401
+    assert json.loads(response.data)['error'] == 'Invalid token'
+
+def test_decoded_token_is_cached(app, client, init_database, monkeypatch):
+    """Test that a token is decoded once and exposes its user through g."""
+    import jwt
+    from flask import g
+    from services.token_service import auth_required
+    
+    token = login_token(client)
+    decoded = []
+    original_decode = jwt.decode
+    monkeypatch.setattr(jwt, 'decode', lambda *args, **kwargs: decoded.append(1) or original_decode(*args, **kwargs))
+    
+    protected = auth_required(lambda: (g.user_id, g.user_role))
+    for _ in range(3):
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            user_id, role = protected()
+    
+    assert role == 'student'
+    assert user_id is not None
+    assert len(decoded) == 1
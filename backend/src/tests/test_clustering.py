@@ -0,0 +1,171 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from models.clustering_result import ClusteringResult
+
+def test_clustering_groups_mutual_pairs(client, voted_formular):
+    """Test that the clustering endpoint groups students who chose each other."""
+    response = client.get(f'/clustering/{voted_formular}')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['status'] == 'success'
+    assert data['group_size'] == 2
+    groups = sorted(sorted(s['email'] for s in group['students']) for group in data['groups'])
+    assert groups == [
+        ['student0@test.com', 'student1@test.com'],
+        ['student2@test.com', 'student3@test.com'],
+        ['student4@test.com', 'student5@test.com']
+    ]
+    assert all(s['id'] is not None for group in data['groups'] for s in group['students'])
+    assert data['metrics']['equity'] == 1.0
+
+def test_clustering_ignores_non_student_voters(app, client, voted_formular):
+    """Test that a teacher who voted on the form is not placed in a group."""
+    from extensions import db
+    from models.auth_user import AuthUser
+    from models.student import Student
+    from models.vote import Vote
+    
+    with app.app_context():
+        teacher = AuthUser(auth_user_email='teacher@test.com', auth_user_mdp='x',
+                           auth_user_name='Test', auth_user_firstname='Teacher')
+        db.session.add(teacher)
+        db.session.flush()
+        chosen = Student.query.filter_by(student_email='student0@test.com').first()
+        db.session.add(Vote(vote_userid=teacher.auth_user_id, vote_formid=voted_formular,
+                            vote_studentid=chosen.student_id, weigth=100))
+        db.session.commit()
+    
+    data = json.loads(client.get(f'/clustering/{voted_formular}').data)
+    emails = sorted(s['email'] for group in data['groups'] for s in group['students'])
+    assert emails == [f'student{i}@test.com' for i in range(6)]
+
+def test_clustering_rejects_invalid_parameters(client, voted_formular):
+    """Test that a negative seed or a non-positive group size is refused with a 400."""
+    for query in ('seed=-1', 'seed=abc', 'group_size=0', 'group_size=-2'):
+        response = client.get(f'/clustering/{voted_formular}?{query}')
+        assert response.status_code == 400
+        assert json.loads(response.data)['status'] == 'error'
+
+def test_clustering_nonexistent_formular(client):
+    """Test clustering a formular that doesn't exist."""
+    response = client.get('/clustering/9999')
+    assert response.status_code == 404
+
+def test_clustering_job_runs_in_background(client, voted_formular):
+    """Test that a clustering job can be created and polled until done."""
+    response = client.post(f'/clustering/{voted_formular}/jobs', json={'seed': 1})
+    assert response.status_code == 202
+    job = json.loads(response.data)
+    assert job['status'] in ('pending', 'running', 'done')
+    
+    deadline = time.time() + 30
+    while job['status'] in ('pending', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+        job = json.loads(client.get(f"/clustering/jobs/{job['job_id']}").data)
+    
+    assert job['status'] == 'done'
+    assert job['progress']['attempt'] == job['progress']['attempts']
+    assert len(job['result']['groups']) == 3
+
+def test_clustering_job_nonexistent_formular(client):
+    """Test creating a job for a formular that doesn't exist."""
+    response = client.post('/clustering/9999/jobs')
+    assert response.status_code == 404
+
+def test_clustering_job_rejects_invalid_fields(client, voted_formular):
+    """Test that a job with a non-integer group size or seed is refused up front."""
+    for body in ({'group_size': 'abc'}, {'group_size': 0}, {'seed': 1.5}, {'seed': -1}):
+        response = client.post(f'/clustering/{voted_formular}/jobs', json=body)
+        assert response.status_code == 400
+
+    job = json.loads(client.post(f'/clustering/{voted_formular}/jobs', json={'group_size': 2}).data)
+    assert set(job['progress']) == {'attempt', 'attempts', 'best_score', 'sizes', 'elapsed'}
+
+def test_get_nonexistent_clustering_job(client):
+    """Test polling a job that doesn't exist."""
+    response = client.get('/clustering/jobs/unknown')
+    assert response.status_code == 404
+
+def test_clustering_result_is_cached(app, client, voted_formular):
+    """Test that a clustering is stored once and reused for the same votes."""
+    first = client.get(f'/clustering/{voted_formular}')
+    second = client.get(f'/clustering/{voted_formular}')
+    assert first.status_code == second.status_code == 200
+    assert json.loads(first.data) == json.loads(second.data)
+    with app.app_context():
+        assert ClusteringResult.query.filter_by(clustering_result_formid=voted_formular).count() == 1
+
+def test_new_vote_invalidates_cached_clustering(app, client, voted_formular):
+    """Test that creating or deleting a vote drops the cached clusterings of its form."""
+    client.get(f'/clustering/{voted_formular}')
+    response = client.post('/votes', json={
+        'userid': 1,
+        'idform': voted_formular,
+        'idstudent': 3,
+        'weight': 10
+    })
+    assert response.status_code == 201
+    with app.app_context():
+        assert ClusteringResult.query.filter_by(clustering_result_formid=voted_formular).count() == 0
+    
+    client.get(f'/clustering/{voted_formular}')
+    client.delete(f"/votes/{json.loads(response.data)['vote_idvote']}")
+    with app.app_context():
+        assert ClusteringResult.query.filter_by(clustering_result_formid=voted_formular).count() == 0
+
+def test_clustering_conditional_get(client, voted_formular):
+    """Test that a client holding the current groups gets a 304."""
+    response = client.get(f'/clustering/{voted_formular}')
+    etag = response.headers['ETag']
+    
+    response = client.get(f'/clustering/{voted_formular}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    
+    response = client.get(f'/clustering/{voted_formular}?seed=1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_form_votes_etag_changes_with_votes(client, voted_formular):
+    """Test that the vote list of a form is revalidated until a vote changes."""
+    etag = client.get(f'/formulars/{voted_formular}/votes').headers['ETag']
+    response = client.get(f'/formulars/{voted_formular}/votes', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    client.post('/votes', json={'userid': 1, 'idform': voted_formular, 'idstudent': 3, 'weight': 10})
+    response = client.get(f'/formulars/{voted_formular}/votes', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 7
+
+def test_clustering_job_event_stream(client, voted_formular):
+    """Test that the event stream relays each attempt and ends with the result."""
+    job = json.loads(client.post(f'/clustering/{voted_formular}/jobs').data)
+    response = client.get(f"/clustering/jobs/{job['job_id']}/events")
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    
+    body = response.get_data(as_text=True)
+    events = [block for block in body.split('\n\n') if block.startswith('event:')]
+    progress = [json.loads(block.split('data: ', 1)[1]) for block in events if block.startswith('event: progress')]
+    assert [event['attempt'] for event in progress] == list(range(1, progress[0]['attempts'] + 1))
+    assert all('elapsed' in event and 'sizes' in event for event in progress)
+    assert events[-1].startswith('event: done')
+
+def test_event_stream_nonexistent_job(client):
+    """Test streaming a job that doesn't exist."""
+    response = client.get('/clustering/jobs/unknown/events')
+    assert response.status_code == 404
+
+def test_api_startup_does_not_import_clustering_engine():
+    """Test that creating the app leaves the scientific stack unloaded."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', (
+        "import sys\n"
+        "from app import create_app\n"
+        "create_app('testing', {'SQLALCHEMY_DATABASE_URI': 'sqlite://'})\n"
+        "print(','.join(m for m in ('numpy', 'scipy', 'sklearn', 'pandas') if m in sys.modules))"
+    )], cwd=src_dir, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ''
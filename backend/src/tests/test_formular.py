@@ -33,6 +33,28 @@ def test_get_formular_by_id(client, init_database):
     assert data['formular_title'] == 'Test Formular'
     assert data['formular_description'] == 'This is a test formular description'
 
+def test_get_formular_conditional(client, init_database):
+    """Test that an unchanged formular is answered with a 304."""
+    create_response = client.post('/formulars', json={
+        'title': 'Test Formular',
+        'description': 'This is a test formular description',
+        'creator_id': 1,
+        'end_date': (datetime.now() + timedelta(days=7)).isoformat(),
+        'nb_person_group': 3
+    })
+    formular_id = json.loads(create_response.data)['formular_id']
+    
+    response = client.get(f'/formulars/{formular_id}')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    
+    response = client.get(f'/formulars/{formular_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    client.put(f'/formulars/{formular_id}', json={'title': 'Renamed'})
+    response = client.get(f'/formulars/{formular_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+
 def test_get_nonexistent_formular(client):
     """Test getting a formular that doesn't exist."""
     response = client.get('/formulars/9999')
@@ -0,0 +1,83 @@
+import numpy as np
+from scipy import sparse
+from algo.initialization import (
+    balancedCapacities, greedyMutualSeeding, louvainCommunities, communityDetectionSeeding
+)
+
+def make_affinity(n, pairs):
+    """Build a symmetric affinity matrix from (i, j, weight) pairs."""
+    affinity = np.zeros((n, n))
+    for i, j, weight in pairs:
+        affinity[i, j] = affinity[j, i] = weight
+    return affinity
+
+def test_balanced_capacities():
+    """Test that capacities match the forceInitialBalance distribution."""
+    assert balancedCapacities(10, 3) == [3, 3, 2, 2]
+    assert balancedCapacities(9, 3) == [3, 3, 3]
+    assert sum(balancedCapacities(31, 4)) == 31
+
+def test_greedy_seeding_groups_mutual_pairs():
+    """Test that the strongest mutual pairs end up in the same group."""
+    names = [f's{i}' for i in range(6)]
+    affinity = make_affinity(6, [(0, 3, 150), (1, 4, 120), (2, 5, 90), (0, 1, 10)])
+    groups = greedyMutualSeeding(names, affinity, 2)
+    assert sorted(sorted(group) for group in groups) == [['s0', 's3'], ['s1', 's4'], ['s2', 's5']]
+
+def test_greedy_seeding_assigns_every_student_once():
+    """Test that isolated students are placed and sizes stay balanced."""
+    names = [f's{i}' for i in range(10)]
+    affinity = make_affinity(10, [(0, 1, 100), (1, 2, 80), (3, 4, 50)])
+    groups = greedyMutualSeeding(names, affinity, 3)
+    members = [name for group in groups for name in group]
+    assert sorted(members) == sorted(names)
+    assert sorted(len(group) for group in groups) == [2, 2, 3, 3]
+    assert any({'s0', 's1', 's2'} <= set(group) for group in groups)
+
+def test_greedy_seeding_accepts_sparse_matrix():
+    """Test that a sparse vote matrix gives the same grouping as the dense one."""
+    names = [f's{i}' for i in range(6)]
+    affinity = make_affinity(6, [(0, 3, 150), (1, 4, 120), (2, 5, 90)])
+    dense_groups = greedyMutualSeeding(names, affinity, 2)
+    sparse_groups = greedyMutualSeeding(names, sparse.csr_matrix(affinity), 2)
+    assert dense_groups == sparse_groups
+
+def test_greedy_seeding_places_leftovers_by_their_votes():
+    """Test that weak voters join the group they voted for, on dense and sparse input."""
+    names = [f's{i}' for i in range(9)]
+    affinity = np.zeros((9, 9))
+    for i, j, weight in [(0, 1, 100), (3, 4, 90), (6, 7, 80)]:
+        affinity[i, j] = affinity[j, i] = weight
+    affinity[2, 3] = 5
+    affinity[5, 0] = 5
+    dense_groups = greedyMutualSeeding(names, affinity, 3)
+    sparse_groups = greedyMutualSeeding(names, sparse.csr_matrix(affinity), 3)
+    assert dense_groups == sparse_groups
+    assert sorted(len(group) for group in dense_groups) == [3, 3, 3]
+    assert any({'s2', 's3', 's4'} == set(group) for group in dense_groups)
+    assert any({'s0', 's1', 's5'} == set(group) for group in dense_groups)
+
+def test_louvain_finds_dense_blocks():
+    """Test that weakly linked cliques are detected as separate communities."""
+    blocks = [(0, 1, 2), (3, 4, 5), (6, 7, 8)]
+    pairs = [(i, j, 50) for block in blocks for i in block for j in block if i < j]
+    affinity = make_affinity(9, pairs + [(2, 3, 5)])
+    labels = louvainCommunities(affinity)
+    assert len(set(labels)) == 3
+    assert all(len({labels[i] for i in block}) == 1 for block in blocks)
+
+def test_community_seeding_resizes_communities():
+    """Test that one large community is split into balanced groups."""
+    names = [f's{i}' for i in range(8)]
+    pairs = [(i, j, 10) for i in range(8) for j in range(i + 1, 8)]
+    groups = communityDetectionSeeding(names, make_affinity(8, pairs), 3)
+    assert sorted(len(group) for group in groups) == [2, 3, 3]
+    assert sorted(name for group in groups for name in group) == sorted(names)
+
+def test_community_seeding_handles_disconnected_graph():
+    """Test that students without any vote are still placed in a group."""
+    names = [f's{i}' for i in range(7)]
+    affinity = make_affinity(7, [(0, 1, 100), (2, 3, 100)])
+    groups = communityDetectionSeeding(names, sparse.csr_matrix(affinity), 2)
+    assert sorted(name for group in groups for name in group) == sorted(names)
+    assert max(len(group) for group in groups) == 2
@@ -0,0 +1,80 @@
+import logging
+import os
+import pytest
+import tempfile
+from app import create_app
+from extensions import db
+
+@pytest.fixture
+def instrumented_app():
+    """Create an app counting the SQL statements of each request."""
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQL_INSTRUMENTATION': True,
+        'SQL_INSTRUMENTATION_HEADERS': True,
+        'SLOW_QUERY_THRESHOLD_MS': 0
+    })
+    with app.app_context():
+        db.create_all()
+    
+    yield app
+    
+    os.close(db_fd)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.unlink(path)
+
+def test_request_statement_headers(instrumented_app):
+    """Test that the statements of a request are counted in its headers."""
+    response = instrumented_app.test_client().get('/students')
+    assert response.status_code == 200
+    assert response.headers['X-SQL-Count'] == '1'
+    assert float(response.headers['X-SQL-Time-Ms']) >= 0
+
+def test_slow_statements_are_logged(instrumented_app, caplog):
+    """Test that statements above the threshold are logged as warnings."""
+    with caplog.at_level(logging.WARNING, logger=instrumented_app.logger.name):
+        instrumented_app.test_client().get('/students')
+    assert any('Slow query' in record.getMessage() and 'student' in record.getMessage()
+               for record in caplog.records)
+
+def test_failed_statements_release_their_timer(instrumented_app):
+    """Test that a failing statement does not leave its start time on the connection."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    
+    with instrumented_app.app_context():
+        connection = db.session.connection()
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text('SELECT * FROM missing_table'))
+        assert connection.info.get('query_start') == []
+        db.session.rollback()
+
+def test_instrumentation_disabled(client):
+    """Test that no header is added when the instrumentation is off."""
+    response = client.get('/students')
+    assert 'X-SQL-Count' not in response.headers
+
+def test_metrics_endpoint(client, init_database):
+    """Test that requests and SQL statements are exposed per route."""
+    client.get('/students')
+    client.get('/students')
+    
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'http_requests_total{method="GET",route="/students",status="200"} 2' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/students"} 2' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/students",le="+Inf"} 2' in body
+    assert 'db_statements_total{route="/students"} 2' in body
+
+def test_metrics_clustering_phases(client, voted_formular):
+    """Test that the clustering engine phases are exposed as histograms."""
+    client.get(f'/clustering/{voted_formular}')
+    
+    body = client.get('/metrics').get_data(as_text=True)
+    for phase in ('ingestion', 'init_mutual', 'local_optimization', 'scoring'):
+        assert f'clustering_phase_seconds_count{{phase="{phase}"}}' in body
@@ -0,0 +1,13 @@
+import json
+import os
+import subprocess
+import sys
+
+def test_trace_on_stdout_is_parseable():
+    """Test that with --trace - only the trace is printed on stdout, the report going to stderr."""
+    algo_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'algo')
+    result = subprocess.run([sys.executable, 'main.py', '--trace', '-'],
+                            cwd=algo_dir, capture_output=True, text=True, check=True)
+    spans = json.loads(result.stdout)
+    assert any(span['name'] == 'localOptimization' for span in spans)
+    assert 'TIMINGS' in result.stderr
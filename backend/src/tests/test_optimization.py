@@ -0,0 +1,129 @@
+import numpy as np
+from algo.optimization import hybridBalancedClustering, kmeansLabelingStream, warmStartClustering
+from algo.profiling import Tracer
+
+def test_hybrid_clustering_with_mutual_strategy():
+    """Test that the mutual seeding strategy can be selected on its own."""
+    names = [f's{i}' for i in range(6)]
+    affinity = np.zeros((6, 6))
+    for i, j in [(0, 3), (1, 4), (2, 5)]:
+        affinity[i, j] = affinity[j, i] = 150
+    groups = hybridBalancedClustering(names, affinity, 2, maxAttempts=1, strategies=["mutual"])
+    assert sorted(sorted(group) for group in groups) == [['s0', 's3'], ['s1', 's4'], ['s2', 's5']]
+
+def test_kmeans_stream_yields_distinct_labelings():
+    """Test that duplicate KMeans labelings are only yielded once."""
+    features = np.array([[0.0, 0.0], [0.1, 0.0], [5.0, 5.0], [5.1, 5.0]])
+    labelings = [labels for labels, _ in kmeansLabelingStream(features, 2, candidates=5, backend="kmeans")]
+    assert len(labelings) == 1
+    assert labelings[0][0] == labelings[0][1] != labelings[0][2] == labelings[0][3]
+
+def test_kmeans_stream_minibatch_backend():
+    """Test that the MiniBatchKMeans backend yields one label per student."""
+    features = np.random.RandomState(0).rand(40, 3)
+    labelings = list(kmeansLabelingStream(features, 4, candidates=3, backend="minibatch"))
+    assert 1 <= len(labelings) <= 3
+    assert all(len(labels) == 40 and inertia >= 0 for labels, inertia in labelings)
+
+def test_kmeans_stream_fits_lazily():
+    """Test that each requested labeling runs one fit, and none run before the first request."""
+    features = np.random.RandomState(0).rand(60, 4)
+    tracer = Tracer()
+    stream = kmeansLabelingStream(features, 6, candidates=10, backend="kmeans", seed=0, tracer=tracer)
+    assert tracer.spans == []
+    
+    for fits in range(1, 4):
+        next(stream)
+        assert len(tracer.spans) == fits
+
+def test_hybrid_clustering_is_reproducible_with_seed():
+    """Test that two runs with the same seed give the same groups."""
+    rng = np.random.default_rng(42)
+    affinity = rng.integers(0, 30, size=(12, 12)).astype(float)
+    np.fill_diagonal(affinity, 0)
+    names = [f's{i}' for i in range(12)]
+    strategies = ["kmeans", "spectral", "random"]
+    first = hybridBalancedClustering(names, affinity, 3, maxAttempts=4, strategies=strategies, seed=7)
+    second = hybridBalancedClustering(names, affinity, 3, maxAttempts=4, strategies=strategies, seed=7)
+    assert first == second
+
+def test_warm_start_repairs_previous_grouping():
+    """Test that removed students are dropped and new students are placed."""
+    names = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+    affinity = np.zeros((7, 7))
+    affinity[6, 0] = affinity[0, 6] = 100  # 'g' is new and close to 'a'
+    previous = [['a', 'b'], ['c', 'd'], ['e', 'f', 'gone']]
+    groups = warmStartClustering(names, affinity, 3, previous, maxIterations=0)
+    assert sorted(name for group in groups for name in group) == names
+    assert ['c', 'd'] in groups
+    assert any({'a', 'g'} <= set(group) for group in groups)
+
+def test_hybrid_clustering_reports_progress():
+    """Test that the progress callback is called once per attempt."""
+    names = [f's{i}' for i in range(6)]
+    affinity = np.ones((6, 6)) - np.eye(6)
+    events = []
+    hybridBalancedClustering(names, affinity, 2, maxAttempts=3, strategies=["mutual", "random"],
+                             seed=0, progressCallback=events.append)
+    assert [event["attempt"] for event in events] == [1, 2, 3]
+    assert all(event["attempts"] == 3 and event["bestScore"] is not None for event in events)
+
+def test_hybrid_clustering_reports_phase_timings():
+    """Test that each engine phase is reported to the metrics recorder."""
+    from algo.metrics import PhaseTimings
+    
+    rng = np.random.default_rng(0)
+    names = [f's{i}' for i in range(8)]
+    affinity = rng.integers(0, 50, size=(8, 8)).astype(float)
+    np.fill_diagonal(affinity, 0)
+    timings = PhaseTimings()
+    hybridBalancedClustering(names, affinity, 2, maxAttempts=3, strategies=["mutual", "kmeans", "random"],
+                             seed=0, metrics=timings)
+    
+    assert set(timings.phases) == {
+        "features", "init_kmeans", "init_mutual", "init_random", "balance", "local_optimization", "scoring"
+    }
+    assert timings.phases["local_optimization"][0] == 3
+    assert timings.summary()[0][2] >= timings.summary()[-1][2]
+
+def test_hybrid_clustering_traces_phases():
+    """Test that the tracer receives nested spans exportable as JSON and folded stacks."""
+    import json
+    
+    rng = np.random.default_rng(0)
+    names = [f's{i}' for i in range(8)]
+    affinity = rng.integers(0, 50, size=(8, 8)).astype(float)
+    np.fill_diagonal(affinity, 0)
+    tracer = Tracer()
+    hybridBalancedClustering(names, affinity, 2, maxAttempts=2, strategies=["kmeans", "random"],
+                             seed=0, tracer=tracer)
+    
+    paths = {";".join(record["path"]) for record in tracer.spans}
+    assert "attempt;KMeans.fit" in paths
+    assert "attempt;StandardScaler" in paths
+    optimizations = [record for record in tracer.spans if record["name"] == "localOptimization"]
+    assert len(optimizations) == 2
+    assert all({"iterations", "moves"} <= set(record["attributes"]) for record in optimizations)
+    
+    assert len(json.loads(tracer.toJson())) == len(tracer.spans)
+    for line in tracer.toFolded().splitlines():
+        stack, micros = line.rsplit(" ", 1)
+        assert stack and int(micros) >= 0
+
+def test_hybrid_clustering_fits_kmeans_only_when_needed():
+    """Test that KMeans is fitted once per KMeans attempt, and not at all for spectral attempts."""
+    
+    rng = np.random.default_rng(1)
+    names = [f's{i}' for i in range(30)]
+    affinity = rng.integers(0, 30, size=(30, 30)).astype(float)
+    np.fill_diagonal(affinity, 0)
+    
+    def fits(strategies):
+        tracer = Tracer()
+        hybridBalancedClustering(names, affinity, 3, maxAttempts=len(strategies), strategies=strategies,
+                                 seed=0, tracer=tracer)
+        return sum(record["name"].endswith("KMeans.fit") for record in tracer.spans)
+    
+    assert fits(["mutual", "kmeans", "kmeans", "random"]) == 2
+    assert fits(["kmeans"] * 4) == 4
+    assert fits(["spectral", "spectral"]) == 0
@@ -65,3 +65,54 @@ def test_create_duplicate_role(client, init_database):
     data = json.loads(response.data)
     assert 'error' in data
     assert 'already exists' in data['error']
+
+def test_role_cache_invalidated_on_create(app, client):
+    """Test that the cached role names include a newly created role."""
+    from services.role_service import RoleService
+    
+    with app.app_context():
+        assert 'reviewer' not in RoleService.role_names().values()
+    
+    response = client.post('/roles', json={'role_name': 'reviewer'})
+    with app.app_context():
+        assert RoleService.role_name(json.loads(response.data)['role_id']) == 'reviewer'
+        assert 'reviewer' in RoleService.role_names().values()
+
+def test_init_db_command_is_idempotent(app, runner):
+    """Test that init-db can run several times without duplicating the default roles."""
+    from models.role import Role
+    
+    for _ in range(2):
+        result = runner.invoke(args=['init-db'])
+        assert result.exit_code == 0
+        assert 'Database migrated successfully' in result.output
+    
+    with app.app_context():
+        names = [role.role_name for role in Role.query.all()]
+    assert sorted(names) == ['admin', 'student', 'teacher']
+
+def test_init_db_reports_removed_duplicate_votes(app, runner):
+    """Test that init-db reports the duplicate votes it removes before indexing votes."""
+    from sqlalchemy import text
+    from extensions import db
+    from models.vote import Vote
+    
+    with app.app_context():
+        db.session.execute(text('DROP INDEX uq_vote_user_form_student'))
+        db.session.add_all([
+            Vote(vote_userid=1, vote_formid=5, vote_studentid=2, weigth=weight) for weight in (10, 20, 30)
+        ] + [
+            Vote(vote_userid=1, vote_formid=5, vote_studentid=3, weigth=weight) for weight in (40, 50)
+        ] + [Vote(vote_userid=2, vote_formid=5, vote_studentid=2, weigth=100)])
+        db.session.commit()
+    
+    result = runner.invoke(args=['init-db'])
+    assert result.exit_code == 0
+    assert 'Removed 3 duplicate votes' in result.output
+    assert 'form 5, voter 1, student 2: 3 votes' in result.output
+    assert 'form 5, voter 1, student 3: 2 votes' in result.output
+    assert 'Created index uq_vote_user_form_student' in result.output
+    
+    with app.app_context():
+        weights = sorted(vote.weigth for vote in Vote.query.filter_by(vote_formid=5))
+    assert weights == [30, 50, 100]
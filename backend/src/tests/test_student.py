@@ -74,6 +74,21 @@ def test_create_students_batch(client):
     assert len(data['success']) == 2
     assert len(data['failed']) == 1
 
+def test_create_students_batch_existing_and_duplicates(client, init_database):
+    """Test that existing and repeated emails of a batch are reported as failed."""
+    response = client.post('/students/batch', json=[
+        {'email': 'student@test.com'},
+        {'email': 'new@test.com'},
+        {'email': 'new@test.com'}
+    ])
+    assert response.status_code == 207
+    data = json.loads(response.data)
+    assert [student['student_email'] for student in data['success']] == ['new@test.com']
+    assert data['success'][0]['student_id'] is not None
+    assert sorted(failure['reason'] for failure in data['failed']) == [
+        'Duplicate email in request', 'Email already exists'
+    ]
+
 def test_update_student(client, init_database):
     """Test updating a student."""
     # First, get all students to find an ID
@@ -100,10 +115,8 @@ def test_delete_student(client, init_database):
     
     # Delete the student
     response = client.delete(f'/students/{student_id}')
-    # TODO: The API currently returns 500 but should return 204 when fixed
-    assert response.status_code == 500  # Temporarily expecting 500 instead of 204
+    assert response.status_code == 204
     
-    # Note: Skip the verification check until the delete endpoint is fixed
     # Verify student is gone
-    # response = client.get(f'/students/{student_id}')
-    # assert response.status_code == 404
+    response = client.get(f'/students/{student_id}')
+    assert response.status_code == 404
@@ -67,6 +67,20 @@ def test_create_teachers_batch(client):
     assert len(data['success']) == 2
     assert len(data['failed']) == 1
 
+def test_create_teachers_batch_existing_and_duplicates(client, init_database):
+    """Test that existing and repeated emails of a batch are reported as failed."""
+    response = client.post('/teachers/batch', json=[
+        {'email': 'teacher@test.com'},
+        {'email': 'new_teacher@test.com'},
+        {'email': 'new_teacher@test.com'}
+    ])
+    assert response.status_code == 207
+    data = json.loads(response.data)
+    assert data['success'] == [{'teacher_email': 'new_teacher@test.com'}]
+    assert sorted(failure['reason'] for failure in data['failed']) == [
+        'Duplicate email in request', 'Email already exists'
+    ]
+
 def test_update_teacher(client, init_database):
     """Test updating a teacher."""
     # Update the teacher
@@ -91,3 +105,12 @@ def test_delete_teacher(client, init_database):
     # Verify teacher is gone
     response = client.get('/teachers/to_delete@test.com')
     assert response.status_code == 404
+
+def test_get_teachers_paginated(client, init_database):
+    """Test keyset pagination of the teacher list by email."""
+    client.post('/teachers/batch', json=[{'email': 'a_teacher@test.com'}, {'email': 'z_teacher@test.com'}])
+    
+    response = client.get('/teachers?limit=1&after=a_teacher@test.com')
+    assert response.status_code == 200
+    assert json.loads(response.data) == [{'teacher_email': 'teacher@test.com'}]
+    assert response.headers['X-Next-Cursor'] == 'teacher@test.com'
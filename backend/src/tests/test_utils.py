@@ -0,0 +1,48 @@
+import pytest
+from extensions import db
+from models.student import Student
+from services.student_service import StudentService
+from services.utils import ensure_app_context, service_scope, chunked
+
+def test_ensure_app_context_outside_context(app, init_database):
+    """Test that a service pushes a context when called outside of one."""
+    assert len(StudentService.get_all_students()) == 1
+
+def test_ensure_app_context_does_not_retry_errors(app):
+    """Test that a RuntimeError raised by the service is not mistaken for a missing context."""
+    calls = []
+    
+    @ensure_app_context
+    def failing():
+        calls.append(1)
+        raise RuntimeError('boom')
+    
+    with app.app_context(), pytest.raises(RuntimeError):
+        failing()
+    assert calls == [1]
+
+def test_service_scope_shares_one_session(app, init_database):
+    """Test that the service calls of a scope share its context and session."""
+    @ensure_app_context
+    def current_session():
+        return db.session()
+    
+    with service_scope(app) as session:
+        sessions = [current_session() for _ in range(3)]
+        assert all(s is session() for s in sessions)
+        assert StudentService.get_all_students()[0]['student_email'] == 'student@test.com'
+
+def test_service_scope_rolls_back_on_error(app):
+    """Test that pending changes of a failed scope are discarded."""
+    with pytest.raises(ValueError):
+        with service_scope(app) as session:
+            session.add(Student(student_email='pending@test.com'))
+            session.flush()
+            raise ValueError
+    
+    with app.app_context():
+        assert Student.query.filter_by(student_email='pending@test.com').first() is None
+
+def test_chunked():
+    """Test splitting values into chunks."""
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
@@ -1,5 +1,6 @@
 import json
 import pytest
+from services.vote_service import VoteService
 
 def test_get_all_votes(client, init_database):
     """Test getting all votes."""
@@ -125,3 +126,121 @@ def test_delete_nonexistent_vote(client):
     assert response.status_code == 404
     data = json.loads(response.data)
     assert 'error' in data
+
+def test_get_form_vote_arrays(app, client, init_database):
+    """Test that form votes are normalized and mapped to students."""
+    other_id = json.loads(client.post('/students', json={'email': 'other@test.com'}).data)['student_id']
+    client.post('/votes', json={'userid': 1, 'idform': 7, 'idstudent': other_id, 'weight': 30})
+    client.post('/votes', json={'userid': 1, 'idform': 7, 'idstudent': 1, 'weight': 30})
+    
+    with app.app_context():
+        arrays = VoteService.get_form_vote_arrays(7)
+    
+    rows = sorted(zip(arrays['voter_emails'], arrays['voter_student_ids'],
+                      arrays['student_emails'], arrays['points']))
+    assert rows == [
+        ('student@test.com', 1, 'other@test.com', 50.0),
+        ('student@test.com', 1, 'student@test.com', 50.0)
+    ]
+
+def test_create_duplicate_vote(client):
+    """Test that a user cannot vote twice for the same student in a form."""
+    vote = {'userid': 1, 'idform': 1, 'idstudent': 2, 'weight': 10}
+    assert client.post('/votes', json=vote).status_code == 201
+    response = client.post('/votes', json=vote)
+    assert response.status_code == 409
+    assert 'error' in json.loads(response.data)
+
+def test_create_votes_batch_replaces_ballot(client, init_database):
+    """Test that a ballot is saved at once and replaces the previous one."""
+    response = client.post('/votes/batch', json={
+        'userid': 1,
+        'idform': 3,
+        'votes': [{'idstudent': 2, 'weight': 60}, {'idstudent': 3, 'weight': 40}]
+    })
+    assert response.status_code == 201
+    
+    response = client.post('/votes/batch', json={
+        'userid': 1,
+        'idform': 3,
+        'votes': [{'idstudent': 4, 'weight': 100}]
+    })
+    assert response.status_code == 201
+    
+    votes = json.loads(client.get('/formulars/3/votes').data)
+    assert [(vote['vote_studentid'], vote['weigth']) for vote in votes] == [(4, 100)]
+
+def test_create_votes_batch_invalid_total(client):
+    """Test that a ballot whose points don't sum to the total is rejected."""
+    response = client.post('/votes/batch', json={
+        'userid': 1,
+        'idform': 3,
+        'votes': [{'idstudent': 2, 'weight': 60}, {'idstudent': 3, 'weight': 30}]
+    })
+    assert response.status_code == 400
+    assert 'sum' in json.loads(response.data)['error']
+    assert json.loads(client.get('/formulars/3/votes').data) == []
+
+def test_get_votes_paginated(client, init_database):
+    """Test keyset pagination of the vote list."""
+    client.post('/votes/batch', json={
+        'userid': 1,
+        'idform': 3,
+        'votes': [{'idstudent': 2, 'weight': 50}, {'idstudent': 3, 'weight': 30}, {'idstudent': 4, 'weight': 20}]
+    })
+    
+    response = client.get('/votes?limit=2')
+    assert response.status_code == 200
+    first_page = json.loads(response.data)
+    assert len(first_page) == 2
+    cursor = response.headers['X-Next-Cursor']
+    assert cursor == str(first_page[-1]['vote_idvote'])
+    
+    response = client.get(f'/votes?limit=2&after={cursor}')
+    second_page = json.loads(response.data)
+    assert len(second_page) == 1
+    assert 'X-Next-Cursor' not in response.headers
+    assert second_page[0]['vote_idvote'] > first_page[-1]['vote_idvote']
+
+def test_get_votes_ndjson(client, init_database):
+    """Test streaming the vote list as NDJSON."""
+    client.post('/votes/batch', json={
+        'userid': 1,
+        'idform': 3,
+        'votes': [{'idstudent': 2, 'weight': 60}, {'idstudent': 3, 'weight': 40}]
+    })
+    
+    response = client.get('/votes?format=ndjson')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['weigth'] for line in lines] == [60, 40]
+
+def test_authenticated_votes_belong_to_the_token_user(client, init_database):
+    """Test that a token holder can only vote, replace ballots and delete votes as themselves."""
+    login = json.loads(client.post('/auth/login', json={
+        'email': 'student@test.com', 'password': 'Password123'
+    }).data)
+    headers = {'Authorization': f"Bearer {login['token']}"}
+    user_id = login['user']['id']
+    
+    response = client.post('/votes/batch', headers=headers, json={
+        'userid': user_id + 1, 'idform': 3, 'votes': [{'idstudent': 2, 'weight': 100}]
+    })
+    assert response.status_code == 403
+    response = client.post('/votes', headers=headers, json={
+        'userid': user_id + 1, 'idform': 3, 'idstudent': 2, 'weight': 100
+    })
+    assert response.status_code == 403
+    
+    response = client.post('/votes/batch', headers=headers, json={
+        'idform': 3, 'votes': [{'idstudent': 2, 'weight': 100}]
+    })
+    assert response.status_code == 201
+    assert json.loads(response.data)['userid'] == user_id
+    
+    other_vote = json.loads(client.post('/votes', json={
+        'userid': user_id + 1, 'idform': 4, 'idstudent': 2, 'weight': 100
+    }).data)['vote_idvote']
+    assert client.delete(f'/votes/{other_vote}', headers=headers).status_code == 403
+    assert client.delete(f'/votes/{other_vote}').status_code == 204
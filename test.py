@@ -24,6 +24,10 @@ VOTES_PER_STUDENT = 15  # Nombre moyen de votes par étudiant
 
 # Liste pour stocker les IDs des étudiants créés
 student_ids = []
+student_emails = {}  # Email de chaque étudiant créé, par ID
+
+# Points à répartir par bulletin (algo.config.TOTAL_POINTS)
+TOTAL_POINTS = 100
 
 def print_header(title):
     """Print a formatted header for test sections"""
@@ -101,10 +105,11 @@ def generate_test_data():
 
 def create_multiple_students():
     """Crée un grand nombre d'étudiants pour les tests"""
-    global student_ids
+    global student_ids, student_emails
     print_header(f"CRÉATION DE {NUM_STUDENTS} ÉTUDIANTS")
     
     student_ids = []
+    student_emails = {}
     
     for i in range(NUM_STUDENTS):
         # Génération d'un email avec un timestamp pour éviter les doublons
@@ -117,6 +122,7 @@ def create_multiple_students():
             if response.status_code == 201:
                 new_id = response.json().get("student_id")
                 student_ids.append(new_id)
+                student_emails[new_id] = student_email
                 print(f"✅ Étudiant créé: {student_email} (ID: {new_id})")
             else:
                 print(f"❌ Échec création étudiant {student_email}: {response.status_code}")
@@ -126,8 +132,27 @@ def create_multiple_students():
     print(f"\nTotal étudiants créés: {len(student_ids)}/{NUM_STUDENTS}")
     return len(student_ids) > 0
 
+def random_ballot(votees):
+    """Répartit aléatoirement TOTAL_POINTS points entre les étudiants choisis"""
+    cuts = sorted(random.sample(range(1, TOTAL_POINTS), len(votees) - 1))
+    weights = [b - a for a, b in zip([0] + cuts, cuts + [TOTAL_POINTS])]
+    return [{"idstudent": votee_id, "weight": weight} for votee_id, weight in zip(votees, weights)]
+
+def register_voter(voter_id):
+    """Inscrit l'étudiant pour qu'il puisse voter et renvoie l'ID de son utilisateur"""
+    response = requests.post(f"{API_BASE_URL}/auth/register", json={
+        "email": student_emails[voter_id],
+        "password": "Password123",
+        "nom": "Test",
+        "prenom": f"Student {voter_id}"
+    })
+    if response.status_code == 201:
+        return response.json()["user"]["id"]
+    print(f"❌ Échec inscription étudiant {voter_id}: {response.status_code}")
+    return None
+
 def create_multiple_votes():
-    """Crée un grand nombre de votes entre les étudiants"""
+    """Crée un bulletin complet par étudiant, envoyé en une seule requête"""
     global formular_id, student_ids
     print_header("CRÉATION DE VOTES MULTIPLES")
     
@@ -140,36 +165,34 @@ def create_multiple_votes():
     
     print(f"Génération de ~{total_votes} votes...")
     
-    # Pour chaque étudiant, créer des votes pour plusieurs autres étudiants
+    # Pour chaque étudiant, envoyer un bulletin répartissant ses points entre plusieurs autres étudiants
     for voter_id in student_ids:
         # Chaque étudiant vote pour VOTES_PER_STUDENT autres étudiants (ou moins s'il n'y a pas assez d'étudiants)
         # Sélectionnons aléatoirement d'autres étudiants pour voter
         potential_votees = [s_id for s_id in student_ids if s_id != voter_id]
         num_votes = min(VOTES_PER_STUDENT, len(potential_votees))
+        if num_votes == 0:
+            continue
         votees = random.sample(potential_votees, num_votes)
         
-        for votee_id in votees:
-            # Générer un poids aléatoire entre 1 et 100
-            weight = random.randint(1, 100)
+        try:
+            user_id = register_voter(voter_id)
+            if user_id is None:
+                continue
             
-            url = f"{API_BASE_URL}/votes"
-            vote_data = {
-                "userid": 1,  # Utilisateur système
+            ballot = {
+                "userid": user_id,
                 "idform": formular_id,
-                "idstudent": votee_id,
-                "weight": weight
+                "votes": random_ballot(votees)
             }
-            
-            try:
-                response = requests.post(url, json=vote_data)
-                if response.status_code == 201:
-                    votes_created += 1
-                    if votes_created % 20 == 0:  # Afficher le progrès tous les 20 votes
-                        print(f"► {votes_created} votes créés...")
-                else:
-                    print(f"❌ Échec création vote: {voter_id}->{votee_id} (weight: {weight}): {response.status_code}")
-            except Exception as e:
-                print(f"❌ Erreur lors de la création du vote: {str(e)}")
+            response = requests.post(f"{API_BASE_URL}/votes/batch", json=ballot)
+            if response.status_code == 201:
+                votes_created += len(ballot["votes"])
+                print(f"► {votes_created} votes créés...")
+            else:
+                print(f"❌ Échec création bulletin de {voter_id}: {response.status_code}")
+        except Exception as e:
+            print(f"❌ Erreur lors de la création du bulletin: {str(e)}")
     
     print(f"\nTotal votes créés: {votes_created}")
     return votes_created > 0